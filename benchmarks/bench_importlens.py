@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# benchmarks/bench_importlens.py
+"""Benchmarks `inspect_imports` and `verify_imports` at scale and writes the results as JSON.
+
+Usage:
+    python benchmarks/bench_importlens.py --output bench.json
+    python benchmarks/bench_importlens.py --sizes 100 1000 --verify-sizes 10 100 --repeat 3
+"""
+import os
+import sys
+import json
+import time
+import types
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+
+# Append the parent directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.importlens import inspect_imports, verify_imports  # noqa: E402
+
+# Modules to bind in the synthetic namespaces, all in the standard library
+MODULE_NAMES = [
+    'abc', 'argparse', 'array', 'base64', 'bisect', 'calendar', 'collections', 'contextlib', 'copy', 'csv',
+    'dataclasses', 'datetime', 'decimal', 'difflib', 'enum', 'fnmatch', 'fractions', 'functools', 'glob',
+    'hashlib', 'heapq', 'html', 'inspect', 'io', 'itertools', 'json', 'logging', 'math', 'operator', 'os',
+    'pathlib', 'pickle', 'pprint', 'queue', 'random', 're', 'shutil', 'statistics', 'string', 'struct',
+    'textwrap', 'threading', 'time', 'typing', 'uuid', 'warnings', 'weakref', 'zlib',
+]
+
+# Fraction of the bindings of each kind, the rest are primitives
+MIX = {'module': 0.05, 'alias': 0.05, 'object': 0.25, 'wildcard': 0.15}
+
+
+def load_modules() -> list[types.ModuleType]:
+    modules = []
+    for name in MODULE_NAMES:
+        try:
+            modules.append(__import__(name))
+        except ImportError:
+            continue
+    return modules
+
+
+def public_objects(module: types.ModuleType) -> list[tuple[str, object]]:
+    """Returns the public callables and classes of a module."""
+    return [
+        (name, obj) for name, obj in sorted(vars(module).items())
+        if not name.startswith('_') and callable(obj) and not isinstance(obj, types.ModuleType)
+    ]
+
+
+def make_namespace(size: int, modules: list[types.ModuleType], seed: int = 0) -> dict:
+    """Builds a namespace with `size` bindings of modules, aliases, objects, wildcard imports and primitives."""
+    rng = random.Random(seed)
+    namespace = {'__name__': '__bench__', '__builtins__': __builtins__}
+    counts = {kind: int(size * fraction) for kind, fraction in MIX.items()}
+
+    for i in range(counts['module']):
+        module = modules[i % len(modules)]
+        namespace[module.__name__ if i < len(modules) else f"{module.__name__}_{i}"] = module
+    for i in range(counts['alias']):
+        namespace[f"mod_alias_{i}"] = rng.choice(modules)
+    object_pool = [obj for module in modules for obj in public_objects(module)]
+    for i in range(counts['object']):
+        name, obj = rng.choice(object_pool)
+        namespace[name if name not in namespace else f"{name}_{i}"] = obj
+    wildcard_objects = [obj for module in rng.sample(modules, len(modules)) for obj in public_objects(module)]
+    for name, obj in wildcard_objects[:counts['wildcard']]:  # like `from module import *`
+        namespace.setdefault(name, obj)
+    i = 0
+    while len(namespace) - 2 < size:
+        namespace[f"var_{i}"] = rng.choice([i, float(i), str(i), [i], {'i': i}, (i,), None, True])
+        i += 1
+    return namespace
+
+
+def run_in_namespace(namespace: dict, **kwargs) -> list[str]:
+    """Calls `inspect_imports` from a frame whose globals are `namespace`."""
+    namespace['inspect_imports'] = inspect_imports
+    code = compile(f"inspect_imports(**{kwargs!r})", '<bench>', 'eval')
+    try:
+        return eval(code, namespace)
+    finally:
+        del namespace['inspect_imports']
+
+
+def timeit(func, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {'min': min(times), 'median': statistics.median(times), 'max': max(times), 'repeat': repeat}
+
+
+def bench_inspect(sizes: list[int], repeat: int) -> list[dict]:
+    modules = load_modules()
+    settings = [
+        {'max_obj': 3, 'ignore': []},
+        {'max_obj': 1000, 'ignore': []},
+        {'max_obj': 3, 'ignore': MODULE_NAMES[::4] + ['floor', 'dumps', 'sqrt']},
+        {'max_obj': 3, 'ignore': [f"pkg_{i}.*" for i in range(300)] + [f"name_{i}*" for i in range(100)] +
+         [f"name_{i}" for i in range(300)]},
+    ]
+    results = []
+    for size in sizes:
+        namespace = make_namespace(size, modules)
+        for kwargs in settings:
+            n_statements = len(run_in_namespace(namespace, **kwargs))  # warm up
+            result = timeit(lambda: run_in_namespace(namespace, **kwargs), repeat)
+            result |= {
+                'size': size,
+                'max_obj': kwargs['max_obj'],
+                'ignore': len(kwargs['ignore']),
+                'statements': n_statements,
+            }
+            results.append(result)
+            print(f"inspect_imports size={size:<7d} max_obj={kwargs['max_obj']:<5d} ignore={len(kwargs['ignore']):<3d} "
+                  f"median={result['median'] * 1000:9.2f} ms", file=sys.stderr)
+    return results
+
+
+def make_import_list(size: int) -> list[str]:
+    import_list = []
+    for module in load_modules():
+        import_list.append(f"import {module.__name__}")
+        import_list.extend(f"from {module.__name__} import {name}" for name, _ in public_objects(module))
+    import_list.extend(f"import dummy_{i}" for i in range(max(0, size - len(import_list))))
+    return import_list[:size]
+
+
+def bench_verify(sizes: list[int], repeat: int, timeout: float) -> list[dict]:
+    results = []
+    for size in sizes:
+        import_list = make_import_list(size)
+        for static in (False, True):
+            result = timeit(lambda: verify_imports(import_list, timeout=timeout, static=static), repeat)
+            result |= {'size': size, 'static': static}
+            results.append(result)
+            print(f"verify_imports  size={size:<7d} static={static!s:<5} median={result['median'] * 1000:9.2f} ms",
+                  file=sys.stderr)
+    return results
+
+
+# Imports all modules in a fresh interpreter, optionally traced, and prints the seconds as JSON
+_TRACER_PROGRAM = """
+import sys, json, time
+sys.path.insert(0, {root!r})
+from src.importlens import ImportTracer
+tracer = ImportTracer()
+{trace} and tracer.start()
+start = time.perf_counter()
+for name in {modules!r}:
+    exec(f"import {{name}}", {{}})
+total = time.perf_counter() - start
+tracer.stop()
+print(json.dumps({{'seconds': total, 'tracer_seconds': tracer.seconds, 'calls': tracer.calls}}))
+"""
+
+
+def bench_tracer(repeat: int) -> list[dict]:
+    """Measures the overhead of `ImportTracer` on importing all `MODULE_NAMES` at startup."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for trace in (False, True):
+        program = _TRACER_PROGRAM.format(root=root, trace=trace, modules=MODULE_NAMES)
+        runs = [
+            json.loads(subprocess.run([sys.executable, '-c', program], capture_output=True, text=True, check=True).stdout)
+            for _ in range(repeat)
+        ]
+        result = {
+            'traced': trace,
+            'median': statistics.median(run['seconds'] for run in runs),
+            'tracer_median': statistics.median(run['tracer_seconds'] for run in runs),
+            'calls': runs[0]['calls'],
+            'repeat': repeat,
+        }
+        results.append(result)
+        print(f"import startup  traced={trace!s:<5} median={result['median'] * 1000:9.2f} ms "
+              f"(tracer {result['tracer_median'] * 1000:.2f} ms, {result['calls']} statements)", file=sys.stderr)
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000],
+                        help="Numbers of bindings in the namespaces for `inspect_imports`.")
+    parser.add_argument('--verify-sizes', type=int, nargs='+', default=[10, 100, 1000],
+                        help="Lengths of the statement lists for `verify_imports`.")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs of each benchmark.")
+    parser.add_argument('--timeout', type=float, default=60, help="Timeout of `verify_imports` in seconds.")
+    parser.add_argument('--output', '-o', help="The JSON file to write. Defaults to stdout.")
+    args = parser.parse_args()
+
+    report = {
+        'commit': git_commit(),
+        'python': sys.version,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'inspect_imports': bench_inspect(args.sizes, args.repeat),
+        'verify_imports': bench_verify(args.verify_sizes, args.repeat, args.timeout),
+        'import_tracer': bench_tracer(args.repeat),
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+###############################################################################|
+if __name__ == '__main__':
+    main()
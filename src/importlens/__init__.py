@@ -1,5 +1,51 @@
 # src/importlens/__init__.py
-from .importlens import inspect_imports
-from .verify import verify_imports
+from .cache import VerificationCache
+from .ignore import IgnoreMatcher
+from .importlens import (
+    ImportRecord, format_imports, format_imports_json, inspect_frames, inspect_imports, inspect_stack,
+    inspect_threads, iter_imports
+)
+from .index import ImportIndex
+from .lazy import generate_lazy_module
+from .reexport import ReexportIndex
+from .resolver import ModuleResolver
+from .session import ImportSession
+from .stats import PhaseStats
+from .static import check_import, scan_file, scan_source, scan_tree
+from .subinterpreters import SubinterpreterPool
+from .tracer import ImportTracer
+from .verify import (
+    ImportProfile, VerificationMatrix, VerificationResult, verify_imports, verify_imports_matrix,
+    verify_imports_parallel
+)
+from .worker import VerifierWorker
 
-__all__ = ['inspect_imports', 'verify_imports']
+__all__ = ['inspect_imports', 'verify_imports', 'ModuleResolver', 'VerifierWorker',
+           'verify_imports_parallel', 'VerificationResult', 'VerificationCache',
+           'scan_source', 'scan_file', 'scan_tree', 'ImportProfile',
+           'generate_lazy_module', 'inspect_frames', 'inspect_stack', 'inspect_threads',
+           'ReexportIndex', 'ImportSession', 'IgnoreMatcher', 'ImportRecord', 'iter_imports',
+           'format_imports', 'format_imports_json', 'ImportTracer',
+           'DistributionIndex', 'generate_requirements', 'check_import',
+           'AsyncVerifier', 'averify_imports', 'VerificationMatrix', 'verify_imports_matrix',
+           'PhaseStats', 'ImportIndex', 'SubinterpreterPool']
+
+# Loaded on first access, since they import `asyncio` and `importlib.metadata`, which are slow to import
+_LAZY_NAMES = {
+    'AsyncVerifier': '.averify', 'averify_imports': '.averify',
+    'DistributionIndex': '.distributions', 'generate_requirements': '.distributions',
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_NAMES))
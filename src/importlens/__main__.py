@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# src/importlens/__main__.py
+"""Runs scripts or modules and prints the reconstructed statements of each as JSON lines.
+
+Usage:
+    python -m importlens --jobs 8 --verify path/to/scripts/ other_script.py
+    python -m importlens --module package.job1 package.job2
+"""
+import os
+import sys
+import json
+import time
+import runpy
+import atexit
+import select
+import signal
+import argparse
+import traceback
+from multiprocessing.connection import Pipe
+
+from .importlens import _compile_ignore, _get_module_resolver, _get_reexport_index, _reconstruct
+from .static import _map_bounded, iter_source_files
+from .verify import verify_imports
+from .worker import VerifierWorker
+
+# The verifier and the fork server of each process in the pool, started on first use in the process
+_worker = None
+_fork_server = None
+_owner_pid = None  # the process that started them, since the processes of the pool may be forked from it
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m importlens', description=__doc__.split('\n')[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter, epilog='\n'.join(__doc__.split('\n')[2:]),
+    )
+    parser.add_argument('targets', nargs='+', help="Scripts, directories of scripts, or modules with --module.")
+    parser.add_argument('--module', '-m', action='store_true', help="Run the targets as modules, like `python -m`.")
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help="The number of worker processes. Defaults to the number of CPUs.")
+    parser.add_argument('--max-obj', type=int, default=3, help="See `inspect_imports`. Defaults to 3.")
+    parser.add_argument('--ignore', nargs='*', default=[], help="See `inspect_imports`. Patterns are accepted.")
+    parser.add_argument('--verify', action='store_true', help="Verify the statements and report the invalid ones.")
+    parser.add_argument('--static', action='store_true', help="See `verify_imports`. Implies --verify.")
+    parser.add_argument('--timeout', type=float, default=60, help="Seconds to run each target. Defaults to 60.")
+    parser.add_argument('--verify-timeout', type=float, default=5,
+                        help="Seconds to verify the statements of each target. Defaults to 5.")
+    args = parser.parse_args(argv)
+
+    options = {
+        'is_module': args.module,
+        'max_obj': args.max_obj,
+        'ignore': _compile_ignore(args.ignore),
+        'verify': args.verify or args.static,
+        'static': args.static,
+        'timeout': args.timeout,
+        'verify_timeout': args.verify_timeout,
+    }
+    targets = args.targets if args.module else (
+        path for target in args.targets for path in iter_source_files(target)
+    )
+    for result in run_targets(targets, jobs=args.jobs, **options):
+        print(json.dumps(result), flush=True)
+    return 0
+
+
+def run_targets(targets, jobs: int | None = None, **options):
+    """Runs each target in a new process forked from a pool of `jobs` workers and yields the results in order."""
+    yield from _map_bounded(_run_isolated, targets, jobs, **options)
+
+
+def _run_isolated(target: str, is_module: bool, max_obj: int, ignore, verify: bool, static: bool,
+                  timeout: float, verify_timeout: float) -> dict:
+    """Runs the target in a forked child so that it leaves nothing in this process, and verifies its statements."""
+    global _fork_server, _worker, _owner_pid
+    start = time.perf_counter()
+    if _owner_pid != os.getpid():  # inherited from the parent, whose threads and children are not ours
+        _fork_server = _worker = None
+        _owner_pid = os.getpid()
+    if hasattr(os, 'fork'):
+        if _fork_server is None:  # before the verifier starts its thread
+            _fork_server = _ForkServer()
+        result = _fork_server.run(target, is_module, max_obj, ignore, timeout)
+    else:  # the target runs in this worker process
+        result = _run_target(target, is_module, max_obj, ignore)
+    if verify and result['imports']:
+        if _worker is None:
+            _worker = VerifierWorker()
+        result['invalid'] = verify_imports(result['imports'], timeout=verify_timeout, worker=_worker, static=static)
+    result['seconds'] = round(time.perf_counter() - start, 6)
+    return result
+
+
+class _ForkServer:
+    """A child process that forks the process running each target by `_run_forked`.
+
+    It is forked before this process starts any threads, e.g., the reader of the `VerifierWorker`, and never
+    starts any itself, so that no process is forked while other threads are running, which may deadlock the child.
+    """
+
+    def __init__(self):
+        self._connection, child_connection = Pipe()
+        self._parent_pid = os.getpid()
+        self.pid = os.fork()
+        if self.pid == 0:  # child
+            try:
+                self._connection.close()
+                while True:
+                    try:
+                        args = child_connection.recv()
+                    except EOFError:  # the parent exited or closed the server
+                        break
+                    child_connection.send(_run_forked(*args))
+            finally:
+                os._exit(0)
+        child_connection.close()
+        atexit.register(self.close)
+
+    def run(self, target: str, is_module: bool, max_obj: int, ignore, timeout: float) -> dict:
+        """Runs the target in a new child of the server. See `_run_forked`."""
+        try:
+            self._connection.send((target, is_module, max_obj, ignore, timeout))
+            return self._connection.recv()
+        except (EOFError, OSError):
+            return {'target': target, 'imports': None, 'error': "The fork server exited unexpectedly."}
+
+    def close(self) -> None:
+        """Stops the server after the target it is running."""
+        if self._connection.closed or os.getpid() != self._parent_pid:
+            return
+        self._connection.close()
+        os.waitpid(self.pid, 0)
+
+
+def _run_forked(target: str, is_module: bool, max_obj: int, ignore, timeout: float) -> dict:
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        try:
+            os.close(r)
+            output = json.dumps(_run_target(target, is_module, max_obj, ignore)).encode()
+            while output:
+                output = output[os.write(w, output):]
+        finally:
+            os._exit(0)
+
+    os.close(w)
+    chunks = []
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            ready, _, _ = select.select([r], [], [], max(deadline - time.monotonic(), 0))
+            if not ready:
+                os.kill(pid, signal.SIGKILL)
+                return {'target': target, 'imports': None, 'error': f"Timed out after {timeout} seconds."}
+            chunk = os.read(r, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(r)
+        os.waitpid(pid, 0)
+    try:
+        return json.loads(b''.join(chunks))
+    except ValueError:
+        return {'target': target, 'imports': None, 'error': "The process exited unexpectedly."}
+
+
+def _run_target(target: str, is_module: bool, max_obj: int, ignore) -> dict:
+    """Runs a script or module as `__main__` with its output discarded and reconstructs its statements."""
+    saved_fds = [os.dup(fd) for fd in (0, 1, 2)]
+    saved_argv = sys.argv
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    sys.argv = [target]
+
+    error = None
+    try:
+        if is_module:
+            namespace = runpy.run_module(target, run_name='__main__', alter_sys=True)
+        else:
+            namespace = runpy.run_path(target, run_name='__main__')
+    except BaseException as e:  # including `SystemExit`, use the globals of the target where it stopped
+        namespace = _module_globals(e.__traceback__)
+        if not isinstance(e, SystemExit) or e.code not in (None, 0):
+            error = ''.join(traceback.format_exception_only(type(e), e)).strip()
+    finally:
+        for fd, saved_fd in zip((0, 1, 2), saved_fds):
+            os.dup2(saved_fd, fd)
+            os.close(saved_fd)
+        os.close(devnull)
+        sys.argv = saved_argv
+    if namespace is None:
+        return {'target': target, 'imports': None, 'error': error}
+
+    import_list = _reconstruct(
+        list(namespace.items()), max_obj, ignore, _get_module_resolver(), reexports=_get_reexport_index()
+    )
+    return {'target': target, 'imports': import_list, 'error': error}
+
+
+def _module_globals(tb) -> dict | None:
+    """Returns the globals of the outermost module-level frame run by `runpy` in a traceback."""
+    while tb is not None:
+        frame = tb.tb_frame
+        if frame.f_code.co_name == '<module>' and frame.f_globals.get('__name__') == '__main__':
+            return frame.f_globals
+        tb = tb.tb_next
+    return None
+
+
+###############################################################################|
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+# src/importlens/averify.py
+"""An asyncio version of `verify_imports` that does not block the event loop."""
+import os
+import sys
+import json
+import asyncio
+import warnings
+
+from .static import check_import
+from .verify import _SHARD_PROGRAM, _STARTUP_TIMEOUT
+
+
+class _Batch:
+    """Statements to be verified by one child process."""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.statements = []
+        self.waiters = 0  # number of requests waiting for the results
+        self.task = None
+
+
+class AsyncVerifier:
+    """Verifies import statements in child processes started by `asyncio.create_subprocess_exec`.
+
+    At most `max_concurrency` child processes run at the same time. Statements requested while a batch is waiting
+    for a free slot are added to that batch, and a statement already being verified is not verified again,
+    so overlapping concurrent requests share the child processes. A child process is killed as soon as
+    all requests waiting for it are cancelled.
+
+    Args:
+        max_concurrency (int): The maximum number of child processes. Defaults to `os.cpu_count()`.
+
+    Attributes:
+        runs (int): The number of child processes started.
+    """
+
+    def __init__(self, max_concurrency: int | None = None):
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self.runs = 0
+        self._loop = None
+        self._semaphore = None
+        self._futures = {}  # statement -> future of 'valid', 'invalid' or 'timed_out', while in flight
+        self._batches = {}  # statement -> batch, while in flight
+        self._queued = {}  # timeout -> batch waiting for a free slot
+
+    async def verify(self, import_list: list[str], timeout=5) -> dict[str, str]:
+        """Verifies the statements and returns `{statement: 'valid', 'invalid' or 'timed_out'}`.
+
+        The statements are stripped in the keys.
+
+        Args:
+            import_list (list): Import statement strings.
+            timeout (float): Seconds to wait for the child process verifying each batch. Defaults to 5.
+        """
+        self._bind_loop()
+        futures = {}
+        for import_str in dict.fromkeys(s.strip() for s in import_list):
+            future = self._futures.get(import_str)
+            if future is None:
+                future = self._futures[import_str] = self._loop.create_future()
+                batch = self._queued.get(timeout)
+                if batch is None:
+                    batch = self._queued[timeout] = _Batch(timeout)
+                    batch.task = self._loop.create_task(self._run(batch))
+                batch.statements.append(import_str)
+                self._batches[import_str] = batch
+            futures[import_str] = future
+        if not futures:
+            return {}
+
+        batches = {self._batches[s] for s in futures}
+        for batch in batches:
+            batch.waiters += 1
+        try:
+            await asyncio.wait(futures.values())  # does not cancel the shared futures when cancelled
+        except asyncio.CancelledError:
+            abandoned = [batch.task for batch in batches if batch.waiters == 1 and not batch.task.done()]
+            for task in abandoned:
+                task.cancel()
+            if abandoned:  # wait until the child processes are killed
+                await asyncio.wait(abandoned)
+            raise
+        finally:
+            for batch in batches:
+                batch.waiters -= 1
+        return {s: future.result() for s, future in futures.items()}
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:  # e.g., a new `asyncio.run`
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._futures.clear()
+            self._batches.clear()
+            self._queued.clear()
+
+    async def _run(self, batch: _Batch) -> None:
+        try:
+            async with self._semaphore:
+                if self._queued.get(batch.timeout) is batch:  # no more statements from now on
+                    del self._queued[batch.timeout]
+                await self._run_batch(batch)
+        finally:
+            if self._queued.get(batch.timeout) is batch:
+                del self._queued[batch.timeout]
+            for import_str in batch.statements:
+                if self._batches.get(import_str) is not batch:  # the state was reset for a new event loop
+                    continue
+                future = self._futures.pop(import_str)
+                del self._batches[import_str]
+                if not future.done():
+                    future.cancel()
+
+    async def _run_batch(self, batch: _Batch) -> None:
+        """Verifies the statements of a batch within its timeout, starting a new process after a crash."""
+        deadline = self._loop.time() + batch.timeout
+        pending = list(batch.statements)
+        while pending:
+            self.runs += 1
+            statuses = {}
+            process = None
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    sys.executable, "-c", _SHARD_PROGRAM,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                process.stdin.write(json.dumps(pending).encode())
+                await process.stdin.drain()
+                process.stdin.close()
+                if await asyncio.wait_for(process.stdout.readline(), _STARTUP_TIMEOUT) != b'ready\n':
+                    raise OSError("The verifier process exited unexpectedly.")
+                while pending:
+                    line = await asyncio.wait_for(process.stdout.readline(), max(deadline - self._loop.time(), 0))
+                    statuses[pending.pop(0)] = line.decode().strip() or 'invalid'  # crashed while importing
+                    if not line:
+                        break
+            except asyncio.TimeoutError:
+                statuses.update(dict.fromkeys(pending, 'timed_out'))
+                pending = []
+            except OSError:
+                statuses.update(dict.fromkeys(pending, 'invalid'))
+                pending = []
+            finally:
+                if process is not None:
+                    if process.returncode is None:
+                        process.kill()
+                    await process.communicate()  # reads to the end so that the pipes are closed
+            # Reply after the process exits, so that no process is left when the callers return
+            for import_str, status in statuses.items():
+                self._futures[import_str].set_result(status)
+
+
+_shared_verifier = None
+
+
+def get_async_verifier() -> AsyncVerifier:
+    """Returns the process-wide verifier, which limits the child processes of all `averify_imports` calls."""
+    global _shared_verifier
+    if _shared_verifier is None:
+        _shared_verifier = AsyncVerifier()
+    return _shared_verifier
+
+
+async def averify_imports(import_list: list[str], timeout=5, verbose=False, cache=None, static=False,
+                          verifier: AsyncVerifier | None = None) -> list[str]:
+    """Verifies the import statements without blocking the event loop and returns a list of invalid ones.
+
+    Concurrent calls share a limited number of child processes. See `AsyncVerifier`.
+    Cancelling the call kills its child process unless other calls are waiting for it.
+    Unlike `verify_imports`, a statement that raises any exception is invalid.
+
+    Args:
+        import_list (list): Import statement strings.
+        timeout (float): Seconds to wait for the verification. Defaults to 5.
+        verbose (bool): Print the progress and the invalid statements. Defaults to False.
+        cache (VerificationCache): See `verify_imports`. Defaults to None.
+        static (bool): See `verify_imports`. Defaults to False.
+        verifier (AsyncVerifier): Defaults to None, in which case the process-wide verifier is used.
+
+    Returns:
+        list: Invalid import statement strings. Statements that could not be verified in time are also returned.
+
+    Examples:
+        >>> from importlens import averify_imports
+        >>> invalid_list = await averify_imports(["import os", "import dummy"])
+    """
+    if not import_list:
+        return []
+
+    # SQLite may wait for its lock and reading the module sources takes time, so both run in threads
+    known = await asyncio.to_thread(cache.get_many, import_list) if cache is not None else {}
+    if static:
+        known.update(await asyncio.to_thread(_check_statically, import_list, known))
+    pending_list = [s for s in import_list if s.strip() not in known]
+
+    verbose and print("Verifying the import statements...")
+    statuses = await (verifier or get_async_verifier()).verify(pending_list, timeout=timeout) if pending_list else {}
+    if cache is not None:
+        await asyncio.to_thread(
+            cache.put_many, {s: status == 'valid' for s, status in statuses.items() if status != 'timed_out'}
+        )
+    if any(status == 'timed_out' for status in statuses.values()):
+        warnings.warn(UserWarning(f"Timed out after {timeout} seconds. Verification failed."))
+
+    invalid_list = [
+        s.strip() for s in import_list
+        if known.get(s.strip()) is False or statuses.get(s.strip(), 'valid') != 'valid'
+    ]
+    if not invalid_list:
+        verbose and print("--- All imports are verified ---")
+    elif verbose:
+        print("--- These import statements are invalid ---")
+        for s in invalid_list:
+            print(f"# {s}")
+        print('-' * 43)
+    return invalid_list
+
+
+def _check_statically(import_list: list[str], known: dict[str, bool]) -> dict[str, bool]:
+    """Returns the statements not in `known` that `check_import` finds valid, which need not be executed."""
+    results = {}
+    for s in import_list:
+        if s.strip() not in known and s.strip() not in results and check_import(s):
+            results[s.strip()] = True
+    return results
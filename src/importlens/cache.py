@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# src/importlens/cache.py
+"""A persistent cache of the verification results."""
+import os
+import sys
+import json
+import site
+import time
+import hashlib
+import sqlite3
+import threading
+import subprocess
+
+
+def default_cache_dir() -> str:
+    """Returns the directory for the cache files of importlens."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'importlens')
+
+
+# Sets `parts` to the interpreter, `sys.path` and the modification times of the site-packages directories
+_ENVIRONMENT_PROGRAM = r"""# Describes the environment
+import os
+import sys
+import site
+
+site_dirs = set(site.getsitepackages() if hasattr(site, 'getsitepackages') else [])
+site_dirs.add(site.getusersitepackages())
+site_dirs.update(p for p in sys.path if os.path.basename(p) in ('site-packages', 'dist-packages'))
+parts = [sys.executable, *sys.path]
+for path in sorted(site_dirs):
+    try:
+        parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+    except OSError:
+        continue
+"""
+_ENVIRONMENT_CODE = compile(_ENVIRONMENT_PROGRAM, '<environment>', 'exec')
+
+
+def environment_fingerprint(executable: str | None = None) -> str:
+    """Returns a hash of the interpreter, `sys.path` and the modification times of the site-packages directories.
+
+    Args:
+        executable (str): The Python interpreter. Defaults to None for this one. Another interpreter is run
+            to read its `sys.path`. If it cannot be run, the hash depends only on its path.
+    """
+    if executable is None or executable == sys.executable:
+        namespace = {}
+        exec(_ENVIRONMENT_CODE, namespace)
+        parts = namespace['parts']
+    else:
+        try:
+            output = subprocess.run(
+                [executable, "-c", _ENVIRONMENT_PROGRAM + "import json\nprint(json.dumps(parts))\n"],
+                capture_output=True, text=True, timeout=30, check=True,
+            ).stdout
+            parts = json.loads(output.splitlines()[-1])
+        except (OSError, subprocess.SubprocessError, ValueError, IndexError):
+            parts = [executable]
+    return hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+
+
+class VerificationCache:
+    """A SQLite cache of whether import statements are valid in the current environment.
+
+    Each result is keyed by the stripped statement and the `environment_fingerprint` of the interpreter that
+    verified it. When the fingerprint of an interpreter changes, e.g., after installing a package,
+    its old results are deleted.
+    The least recently used results are evicted when there are more than `max_entries`.
+
+    Args:
+        path (str): The SQLite file. Defaults to 'verify.sqlite3' in `default_cache_dir()`.
+        max_entries (int): The maximum number of results to keep. Defaults to 100000.
+
+    Examples:
+        >>> from importlens import VerificationCache, verify_imports
+        >>> with VerificationCache() as cache:
+        ...     invalid_list = verify_imports(["import os", "import dummy"], cache=cache)
+    """
+
+    def __init__(self, path: str | None = None, max_entries: int = 100000):
+        if path is None:
+            os.makedirs(default_cache_dir(), exist_ok=True)
+            path = os.path.join(default_cache_dir(), 'verify.sqlite3')
+        self.path = path
+        self.max_entries = max_entries
+        self._fingerprints = {}  # executable -> the last fingerprint seen
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "executable TEXT, fingerprint TEXT, statement TEXT, valid INTEGER, used REAL, "
+                "PRIMARY KEY (fingerprint, statement))"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Closes the SQLite connection."""
+        self._connection.close()
+
+    def get_many(self, import_list: list[str], executable: str | None = None) -> dict[str, bool]:
+        """Returns the cached results as a dict of {stripped statement: is valid}. Misses are not included.
+
+        Args:
+            import_list (list): Import statement strings.
+            executable (str): The interpreter the results are for. Defaults to `sys.executable`.
+        """
+        statements = list({s.strip() for s in import_list})
+        fingerprint = self._check_fingerprint(executable or sys.executable)
+        results = {}
+        with self._lock, self._connection:
+            for i in range(0, len(statements), 500):  # below the limit of SQLite variables
+                chunk = statements[i:i + 500]
+                rows = self._connection.execute(
+                    f"SELECT statement, valid FROM results WHERE fingerprint = ? "
+                    f"AND statement IN ({', '.join('?' * len(chunk))})",
+                    [fingerprint, *chunk]
+                ).fetchall()
+                results.update((statement, bool(valid)) for statement, valid in rows)
+            if results:
+                self._connection.executemany(
+                    "UPDATE results SET used = ? WHERE fingerprint = ? AND statement = ?",
+                    [(time.time(), fingerprint, statement) for statement in results]
+                )
+        return results
+
+    def put_many(self, results: dict[str, bool], executable: str | None = None) -> None:
+        """Stores a dict of {statement: is valid} and evicts the least recently used results if needed.
+
+        Args:
+            results (dict): {statement: is valid}.
+            executable (str): The interpreter that verified the statements. Defaults to `sys.executable`.
+        """
+        if not results:
+            return
+        executable = executable or sys.executable
+        fingerprint = self._check_fingerprint(executable)
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                [(executable, fingerprint, s.strip(), int(valid), now) for s, valid in results.items()]
+            )
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()
+            if count > self.max_entries:
+                self._connection.execute(
+                    "DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY used LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+
+    def clear(self) -> None:
+        """Deletes all results."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM results")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _check_fingerprint(self, executable: str) -> str:
+        """Returns the current fingerprint of an interpreter, deleting its results if it has changed."""
+        fingerprint = environment_fingerprint(executable)
+        if fingerprint != self._fingerprints.get(executable):
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "DELETE FROM results WHERE executable = ? AND fingerprint != ?", (executable, fingerprint)
+                )
+            self._fingerprints[executable] = fingerprint
+        return fingerprint
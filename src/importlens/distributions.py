@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# src/importlens/distributions.py
+"""A persistent index of the installed distributions providing each top-level module."""
+import os
+import ast
+import sys
+import json
+from importlib import metadata
+
+from .cache import default_cache_dir, environment_fingerprint
+from .static import _parse_import
+
+
+class DistributionIndex:
+    """Maps top-level module names to the installed distributions and versions that provide them.
+
+    The index is built once from the metadata of all distributions on `sys.path`, the same way as
+    `importlib.metadata.packages_distributions`, and saved to a JSON file with the environment fingerprint,
+    which changes when packages are installed or removed. A saved index of another fingerprint is rebuilt.
+    Lookups are dict lookups.
+
+    Args:
+        path (str): The JSON file to load and save. Defaults to a file in `default_cache_dir()` named after
+            the environment fingerprint. If False, the index is always built and never saved.
+
+    Examples:
+        >>> from importlens import DistributionIndex
+        >>> DistributionIndex().lookup('numpy.random')
+        [('numpy', '1.26.4')]
+    """
+
+    def __init__(self, path: str | bool | None = None):
+        self._fingerprint = environment_fingerprint()
+        if path is None:
+            path = os.path.join(default_cache_dir(), f"distributions-{self._fingerprint[:16]}.json")
+        self.path = path
+        self._modules = None  # top-level module -> [[distribution, version], ...]
+        if self.path:
+            try:
+                with open(self.path) as f:
+                    saved = json.load(f)
+                if saved['fingerprint'] == self._fingerprint:
+                    self._modules = saved['modules']
+            except (OSError, ValueError, TypeError, KeyError):
+                pass
+        if self._modules is None:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Reads the metadata of all installed distributions again and saves the index."""
+        modules = {}
+        seen = set()
+        for dist in metadata.distributions():
+            dist_metadata = dist.metadata  # parsed on every access
+            name, version = dist_metadata['Name'], dist_metadata['Version']
+            if not name or name.lower() in seen:  # shadowed by an earlier entry of `sys.path`
+                continue
+            seen.add(name.lower())
+            for module in _top_level_modules(dist):
+                entries = modules.setdefault(module, [])
+                if [name, version] not in entries:
+                    entries.append([name, version])
+        self._modules = modules
+        self._fingerprint = environment_fingerprint()
+        self.save()
+
+    def lookup(self, module_name: str) -> list[tuple[str, str]]:
+        """Returns `(distribution, version)` of each distribution providing the top-level package of a module."""
+        return [tuple(entry) for entry in self._modules.get(module_name.partition('.')[0], [])]
+
+    def requirements(self, import_list: list[str]) -> list[str]:
+        """Returns the sorted 'distribution==version' requirements of the modules imported by the statements.
+
+        Modules in the standard library and those not provided by any distribution are left out.
+
+        Raises:
+            ValueError: If a statement is not an import statement.
+        """
+        stdlib = getattr(sys, 'stdlib_module_names', frozenset())
+        requirements = set()
+        for import_str in import_list:
+            for node in _parse_import(import_str):
+                module_names = [alias.name for alias in node.names] if isinstance(node, ast.Import) else [node.module]
+                for module_name in module_names:
+                    if module_name.partition('.')[0] in stdlib:
+                        continue
+                    requirements.update(f"{name}=={version}" for name, version in self.lookup(module_name))
+        return sorted(requirements, key=str.casefold)
+
+    def save(self, path: str | None = None) -> None:
+        """Saves the index to a JSON file."""
+        path = path or self.path
+        if not path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'fingerprint': self._fingerprint, 'modules': self._modules}, f)
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+
+def _top_level_modules(dist: metadata.Distribution) -> set[str]:
+    """Returns the top-level modules of a distribution from 'top_level.txt', or else from its installed files."""
+    text = dist.read_text('top_level.txt')
+    if text:
+        return {line.strip() for line in text.splitlines() if line.strip()}
+    modules = set()
+    for file in dist.files or []:
+        parts = file.parts
+        if not parts or parts[0] == '..' or parts[0].endswith(('.dist-info', '.egg-info', '.data')):
+            continue
+        if len(parts) > 1:
+            if parts[0] != '__pycache__' and '.' not in parts[0]:  # not 'numpy.libs'
+                modules.add(parts[0])
+        elif file.suffix in ('.py', '.pyd', '.so'):
+            modules.add(parts[0].partition('.')[0])
+    return modules
+
+
+_shared_index = None
+
+
+def get_distribution_index() -> DistributionIndex:
+    """Returns the process-wide index, rebuilt if the environment fingerprint changed."""
+    global _shared_index
+    path = os.path.join(default_cache_dir(), f"distributions-{environment_fingerprint()[:16]}.json")
+    if _shared_index is None or _shared_index.path != path:
+        _shared_index = DistributionIndex(path)
+    return _shared_index
+
+
+def generate_requirements(import_list: list[str]) -> list[str]:
+    """Returns the 'distribution==version' requirements of the modules imported by the statements.
+
+    Args:
+        import_list (list): Import statement strings, e.g., returned by `inspect_imports`.
+
+    Returns:
+        list: Requirement strings, sorted (case-insensitive). Modules in the standard library are left out.
+
+    Examples:
+        >>> from importlens import inspect_imports, generate_requirements
+        >>> with open('requirements.txt', 'w') as f:
+        ...     f.write('\\n'.join(generate_requirements(inspect_imports())))
+    """
+    return get_distribution_index().requirements(import_list)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# src/importlens/ignore.py
+"""A precompiled matcher of the modules and objects to be ignored."""
+import re
+import fnmatch
+
+
+class IgnoreMatcher:
+    """Matches names against many ignore patterns in about constant time.
+
+    Build it once and pass it as `ignore` to `inspect_imports` and the other functions instead of a list.
+    Plain lists are compiled on every call.
+
+    Patterns:
+        - 'name': An exact module, object or alias name, the same as in a list.
+        - 'package.*': Any dotted name under 'package', e.g., 'package.sub' and 'package.sub.obj'.
+        - Other patterns with '*', '?' or '[...]' are matched by `fnmatch` rules, case-sensitive, e.g., '_pytest*'.
+
+    Args:
+        patterns (iterable): Ignore patterns. Defaults to ().
+
+    Examples:
+        >>> from importlens import IgnoreMatcher, inspect_imports
+        >>> ignore = IgnoreMatcher(['matplotlib.*', '_pytest*', 'np'])
+        >>> import_list = inspect_imports(ignore=ignore)
+    """
+
+    __slots__ = ('patterns', '_exact', '_prefixes', '_glob')
+
+    def __init__(self, patterns=()):
+        self.patterns = list(patterns)
+        self._exact = set()
+        self._prefixes = {}  # trie of the dotted parts, where `None` marks the end of a prefix
+        globs = []
+        for pattern in self.patterns:
+            if pattern.endswith('.*') and not _has_magic(pattern[:-2]):
+                node = self._prefixes
+                for part in pattern[:-2].split('.'):
+                    node = node.setdefault(part, {})
+                node[None] = True
+            elif _has_magic(pattern):
+                globs.append(fnmatch.translate(pattern))
+            else:
+                self._exact.add(pattern)
+        self._glob = re.compile('|'.join(globs)).match if globs else None
+
+    @classmethod
+    def compile(cls, ignore) -> 'IgnoreMatcher':
+        """Returns `ignore` if it is already a matcher, or a new matcher of the patterns."""
+        return ignore if isinstance(ignore, cls) else cls(ignore)
+
+    def __contains__(self, value: str) -> bool:
+        if value in self._exact:
+            return True
+        if self._prefixes:
+            node = self._prefixes
+            parts = value.split('.')
+            for part in parts[:-1]:  # at least one more part after the prefix
+                node = node.get(part)
+                if node is None:
+                    break
+                if None in node:
+                    return True
+        return self._glob is not None and self._glob(value) is not None
+
+    def matches(self, module_name: str, obj_name: str, name: str) -> bool:
+        """Returns True if the module, the object or its alias `name` matches any pattern."""
+        return (
+            module_name in self or module_name.partition('.')[0] in self or
+            obj_name in self or obj_name.rpartition('.')[2] in self or
+            name in self or name.rpartition('.')[2] in self
+        )
+
+    def __iter__(self):
+        return iter(self.patterns)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def __add__(self, other) -> 'IgnoreMatcher':
+        return IgnoreMatcher(self.patterns + list(other))
+
+    def __reduce__(self):  # for the worker processes of `scan_tree`
+        return (type(self), (self.patterns,))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.patterns!r})"
+
+
+def _has_magic(pattern: str) -> bool:
+    return any(c in pattern for c in '*?[')
@@ -2,110 +2,421 @@
 # src/importlens/importlens.py
 """Functions to inspect imported modules in the caller's frame."""
 
+# Module names that can be replaced, used when `ReexportIndex` is not available
+# Only a few common ones are listed here. Add more if needed.
+module_mapping = {
+    '_bisect': 'bisect',  # verified
+    '_csv': 'csv',  # verified
+    '_heapq': 'heapq',  # verified
+    '_operator': 'operator',  # verified
+    '_functools': 'functools',  # verified
+}
 
-def inspect_imports(max_obj: int = 3, ignore: list[str] = []) -> list[str]:
+
+# `typing` is not bound here, so that it is not inspected when this file is pasted into the caller's namespace
+class ImportRecord(__import__('typing').NamedTuple):
+    """An imported name, yielded by `iter_imports`.
+
+    Attributes:
+        module (str): The module to import, or to import the object from.
+        name (str): The object to import from the module, or None for `import module`.
+        alias (str): The name the module or object is bound to if different, otherwise None.
+        kind (str): 'module' for `import ...`, or 'object' for `from ... import ...`.
+    """
+    module: str
+    name: str | None
+    alias: str | None
+    kind: str
+
+    def statement(self) -> str:
+        """Returns the statement importing this name alone."""
+        alias = f" as {self.alias}" if self.alias else ''
+        if self.kind == 'module':
+            return f"import {self.module}{alias}"
+        return f"from {self.module} import {self.name}{alias}"
+
+
+def _is_ignored(module_name: str, obj_name: str, name: str, ignore: list[str]) -> bool:
+    """Returns True if the module, the object or its alias `name` matches any item in `ignore`."""
+    if hasattr(ignore, 'matches'):  # `IgnoreMatcher`
+        return ignore.matches(module_name, obj_name, name)
+    return (
+        module_name in ignore or module_name.split('.')[0] in ignore or
+        obj_name in ignore or obj_name.split('.')[-1] in ignore or
+        name in ignore or name.split('.')[-1] in ignore
+    )
+
+
+def _format_statements(regular_import_str_list: list[str], specific_import_str_list: list[str],
+                       imports: dict[str, list[str]], max_obj: int) -> list[str]:
+    """Formats the names grouped by modules in `imports` and returns all statements sorted."""
+    specific_import_str_list = list(specific_import_str_list)
+
+    # Format the specific imports
+    for module, names in imports.items():
+        if len(names) > max_obj:  # wildcard imports
+            specific_import_str_list.append(f"from {module} import *")
+        else:
+            specific_import_str_list.append(f"from {module} import {', '.join(names)}")
+
+    # Sort (case-insensitive) each list and return a joined list
+    return (
+        sorted(regular_import_str_list, key=str.casefold) +
+        sorted(specific_import_str_list, key=str.casefold)
+    )
+
+
+def format_imports(records, max_obj: int = 3) -> list[str]:
+    """Formats import records as the statements returned by `inspect_imports`.
+
+    Objects imported from the same module without aliases are grouped into one `from ... import ...`,
+    in the order they are given.
+
+    Args:
+        records (iterable): `ImportRecord` objects, e.g., yielded by `iter_imports`. Duplicates are removed.
+        max_obj (int): See `inspect_imports`. Defaults to 3.
+
+    Returns:
+        list: Import statement strings.
+    """
+    imports = {}
+    regular_import_str_list = []
+    specific_import_str_list = []
+    for record in dict.fromkeys(records):
+        if record.kind == 'module':
+            regular_import_str_list.append(record.statement())
+        elif record.alias:
+            specific_import_str_list.append(record.statement())
+        else:
+            imports.setdefault(record.module, []).append(record.name)
+    return _format_statements(regular_import_str_list, specific_import_str_list, imports, max_obj)
+
+
+def format_imports_json(records, indent: int | None = None) -> str:
+    """Formats import records as a JSON array of objects with the keys 'module', 'name', 'alias' and 'kind'.
+
+    Args:
+        records (iterable): `ImportRecord` objects, e.g., yielded by `iter_imports`. Duplicates are removed.
+        indent (int): See `json.dumps`. Defaults to None.
+
+    Returns:
+        str: JSON text.
+    """
+    import json
+
+    return json.dumps([record._asdict() for record in dict.fromkeys(records)], indent=indent)
+
+
+def iter_imports(ignore: list[str] = [], frame=None):
+    """Yields an `ImportRecord` of each imported name in the immediate caller's frame, without formatting.
+
+    Each record is yielded once, in the order the names are bound. Stop iterating at any time to skip the rest.
+
+    Args:
+        ignore (list): See `inspect_imports`. Defaults to [].
+        frame (frame): The frame to inspect. Defaults to None, in which case the caller's frame is inspected.
+
+    Yields:
+        ImportRecord: (module, name, alias, kind).
+
+    Examples:
+        >>> from importlens import iter_imports, format_imports
+        >>> modules = {record.module for record in iter_imports()}
+        >>> print('\\n'.join(format_imports(r for r in iter_imports() if r.kind == 'object')))
+    """
+    import sys
+
+    if frame is None:
+        frame = sys._getframe(1)
+    return _iter_records(
+        _frame_namespace(frame).items(), _compile_ignore(ignore), _get_module_resolver(), {}, _get_reexport_index()
+    )
+
+
+def inspect_imports(max_obj: int = 3, ignore: list[str] = [], stats=None) -> list[str]:
     """Inspects all imported modules in the immediate caller's frame and reconstructs the statements.
 
     Args:
         max_obj (int): If more than `max_obj` are imported from a module, they will be represented as a wildcard,
             i.e., `from ... import *`. Defaults to 3. Increase the value if needed.
         ignore (list): Modules or objects, including aliases, to be ignored. Defaults to [].
+            Patterns like 'matplotlib.*' and '_pytest*' are also accepted. See `IgnoreMatcher`.
+        stats (PhaseStats): Accumulates the time of each phase and the counts of objects. Defaults to None.
 
     Returns:
         list: Import statement strings.
 
     Examples:
-        In a LeetCode editor, copy & paste this function then call it by `print('\\n'.join(inspect_imports()))`.
+        In a LeetCode editor, copy & paste the content of this file then call it by `print('\\n'.join(inspect_imports()))`.
 
         In console:
         >>> from importlens import inspect_imports
         >>> print('\\n'.join(inspect_imports()))
 
+    Each object is imported from the shortest public module path that re-exports it, e.g., `os` rather than `posix`.
+    See `ReexportIndex`. When this file is copied to somewhere else, only the names in `module_mapping` are replaced.
+
     **Limitations:**
     1. Variables of primitive types will be ignored since they will lose their connection to the modules after being imported.
     2. If some objects imported from module A are shown as from module B by `__module__` or `inspect.getmodule`, \
-        but are not accessible in module B, then wrong statements might be returned. \
-        E.g., 'monitoring' in 'sys' and 'c_make_encoder' in 'json.encoder'.
+        but are not accessible in module B or any module importing them, then wrong statements might be returned.
     """
-    # Module names that can be replaced
-    # Only a few common ones are listed here. Add more if needed.
-    module_mapping = {
-        '_bisect': 'bisect',  # verified
-        '_csv': 'csv',  # verified
-        '_heapq': 'heapq',  # verified
-        '_operator': 'operator',  # verified
-        '_functools': 'functools',  # verified
-    }
-
     import inspect
 
     # Get all objects in the caller's frame
     frame=inspect.currentframe().f_back  # `f_back`: the immediate caller's frame (next outer frame)
+    if stats is None:
+        namespace = _frame_namespace(frame)
+    else:
+        with stats.phase('capture'):
+            namespace = _frame_namespace(frame)
+    return _reconstruct(
+        namespace.items(), max_obj, _compile_ignore(ignore), _get_module_resolver(),
+        reexports=_get_reexport_index(), stats=stats
+    )
+
+
+def inspect_frames(frames, max_obj: int = 3, ignore: list[str] = [], group_by: str = 'frame',
+                   stats=None) -> dict[str, list[str]]:
+    """Inspects the imported modules in many frames in one pass and reconstructs the statements of each group.
+
+    Each object is resolved only once, however many frames it is bound in.
+
+    Args:
+        frames (iterable): Frame objects, or `(label, frame)` pairs to label the groups.
+        max_obj (int): See `inspect_imports`. Defaults to 3.
+        ignore (list): See `inspect_imports`. Defaults to [].
+        group_by (str): 'frame' to reconstruct the statements of each frame,
+            or 'module' to merge the frames of the same module. Defaults to 'frame'.
+        stats (PhaseStats): See `inspect_imports`. Defaults to None.
+
+    Returns:
+        dict: {label: import statement strings}. A frame is labeled as 'function (file:line)' by default,
+            and a module by its `__name__`. Frames with the same label are merged.
+    """
+    import time
+
+    if group_by not in ('frame', 'module'):
+        raise ValueError(f"group_by must be 'frame' or 'module', not {group_by!r}")
+
+    # Group the bindings, removing the duplicates of the same object under the same name
+    start = stats is not None and time.perf_counter()
+    groups = {}
+    for frame in frames:
+        label, frame = frame if isinstance(frame, tuple) else (None, frame)
+        if group_by == 'module':
+            label = frame.f_globals.get('__name__', '?')
+        elif label is None:
+            label = f"{frame.f_code.co_name} ({frame.f_code.co_filename}:{frame.f_lineno})"
+        bindings = groups.setdefault(label, {})
+        for name, obj in _frame_namespace(frame).items():
+            bindings.setdefault((name, id(obj)), (name, obj))
+    stats is not None and stats.add('capture', time.perf_counter() - start)
+
+    ignore = _compile_ignore(ignore)
+    getmodule = _get_module_resolver()
+    reexports = _get_reexport_index()
+    memo = {}  # shared by all groups
+    return {
+        label: _reconstruct(bindings.values(), max_obj, ignore, getmodule, memo, reexports, stats)
+        for label, bindings in groups.items()
+    }
+
+
+def inspect_stack(max_obj: int = 3, ignore: list[str] = [], group_by: str = 'frame',
+                  limit: int | None = None, stats=None) -> dict[str, list[str]]:
+    """Inspects the imported modules in the caller's frame and all outer frames. See `inspect_frames`.
+
+    Args:
+        limit (int): The maximum number of frames, starting from the caller's frame. Defaults to None (all).
+
+    Examples:
+        >>> from importlens import inspect_stack
+        >>> for label, import_list in inspect_stack().items():
+        ...     print(label, import_list)
+    """
+    import sys
+
+    frames = []
+    frame = sys._getframe(1)
+    while frame is not None and (limit is None or len(frames) < limit):
+        frames.append(frame)
+        frame = frame.f_back
+    return inspect_frames(frames, max_obj=max_obj, ignore=ignore, group_by=group_by, stats=stats)
+
+
+def inspect_threads(max_obj: int = 3, ignore: list[str] = [], group_by: str = 'frame',
+                    stats=None) -> dict[str, list[str]]:
+    """Inspects the imported modules in the frames of all threads. See `inspect_frames`.
+
+    With `group_by='frame'`, frames are labeled as 'thread name: function (file:line)'.
+    The frames of the current thread start from the caller's frame.
+    """
+    import sys
+    import threading
+
+    thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+    current = threading.get_ident()
+    frames = []
+    for ident, frame in sys._current_frames().items():
+        if ident == current:
+            frame = sys._getframe(1)
+        while frame is not None:
+            label = f"{thread_names.get(ident, ident)}: {frame.f_code.co_name} ({frame.f_code.co_filename}:{frame.f_lineno})"
+            frames.append((label, frame))
+            frame = frame.f_back
+    return inspect_frames(frames, max_obj=max_obj, ignore=ignore, group_by=group_by, stats=stats)
+
+
+def _get_module_resolver():
+    """Returns a function to find the module an object is defined in."""
+    # Resolve the modules from an index of module attributes if available, which is much faster than
+    # `inspect.getmodule` for large namespaces. Falls back when this file is copied to somewhere else.
+    try:
+        from .resolver import get_resolver
+        return get_resolver().getmodule
+    except ImportError:
+        import inspect
+        return inspect.getmodule
+
+
+def _get_reexport_index():
+    """Returns the index of the public modules re-exporting each object, or None if not available."""
+    # Falls back to `module_mapping` when this file is copied to somewhere else.
+    try:
+        from .reexport import get_reexport_index
+        return get_reexport_index()
+    except ImportError:
+        return None
+
+
+def _compile_ignore(ignore):
+    """Returns a precompiled `IgnoreMatcher` of the ignore list if available, otherwise the list itself."""
+    # Falls back to the plain list, without the patterns, when this file is copied to somewhere else.
+    try:
+        from .ignore import IgnoreMatcher
+        return IgnoreMatcher.compile(ignore)
+    except ImportError:
+        return ignore
+
+
+def _frame_namespace(frame) -> dict:
+    """Returns all objects in the frame."""
     globals_dict = frame.f_globals | frame.f_locals
 
     # Remove local modules
     for module in ['inspect',]:
         globals_dict.pop(module, None)
+    return globals_dict
 
-    imports = {}
-    regular_import_str_list = []
-    specific_import_str_list = []
 
-    # Check each object
-    for name, obj in globals_dict.items():
-        if name.startswith('__'):
-            continue
-
-        # `inspect.getmodule` returns the module the object is defined in, or None if not found.
-        module = inspect.getmodule(obj)
-
-        if module:
-            try:
-                obj_name = obj.__name__
-                module_name = module.__name__
-                # print(name, obj_name, module_name)
-
-                # Replace module names
-                if module_name in module_mapping:
-                    module_name = module_mapping[module_name]
-
-                # Skip exceptions
-                if (
-                    module_name.startswith('__') or
-                    module_name in [__name__,] + ignore or module_name.split('.')[0] in ignore or
-                    obj_name in ignore or obj_name.split('.')[-1] in ignore or
-                    name in ignore or name.split('.')[-1] in ignore
-                ):
-                    continue
-
-                # Identify this object
-                if inspect.ismodule(obj) and obj_name == module_name:  # this object is the module itself
-                    if name == obj_name:  # is not an alias
-                        regular_import_str_list.append(f"import {obj_name}")
-                    else:  # is an alias
-                        regular_import_str_list.append(f"import {obj_name} as {name}")
-                else:  # this object is from this module
-                    if '.'.join([module_name, obj_name]) in ignore:  # check the name 'module.object'
-                        continue
-                    if name == obj_name:  # is not an alias
-                        if module_name not in imports:
-                            imports[module_name] = []
-                        imports[module_name].append(name)
-                    else:  # is an alias
-                        specific_import_str_list.append(f"from {module_name} import {obj_name} as {name}")
-
-            except AttributeError:
-                pass
+def _identify(obj, ignore: list[str], getmodule, reexports=None) -> tuple[str, str, bool] | None:
+    """Returns `(module_name, obj_name, is_module)` of an imported object, or None if it should be skipped.
 
-    # Format the specific imports
-    for module, names in imports.items():
-        if len(names) > max_obj:  # wildcard imports
-            specific_import_str_list.append(f"from {module} import *")
+    `module_name` is the public module to import the object from if `reexports` is given.
+    """
+    from types import ModuleType
+
+    # `getmodule` returns the module the object is defined in, or None if not found.
+    module = getmodule(obj)
+    if not module:
+        return None
+    try:
+        obj_name = obj.__name__
+        module_name = module.__name__
+        # print(obj_name, module_name)
+
+        # Skip exceptions
+        if module_name.startswith('__') or module_name == __name__:
+            return None
+
+        is_module = isinstance(obj, ModuleType) and obj_name == module_name  # this object is the module itself
+
+        # Replace module names
+        if reexports is None:
+            module_name = module_mapping.get(module_name, module_name)
+        elif is_module:
+            located = reexports.locate_module(obj)
+            if located:  # not importable by its own name, e.g., 'sys.monitoring'
+                module_name, obj_name = located
+                is_module = False
         else:
-            specific_import_str_list.append(f"from {module} import {', '.join(names)}")
+            module_name, obj_name = reexports.locate(obj, module_name, obj_name)
+            module_name = module_mapping.get(module_name, module_name)
+        if _is_ignored(module_name, obj_name, '', ignore):  # the module to import from, not the defining one
+            return None
 
-    # Sort (case-insensitive) each list and return a joined list
-    return (
-        sorted(regular_import_str_list, key=str.casefold) +
-        sorted(specific_import_str_list, key=str.casefold)
-    )
+        # Identify this object
+        if is_module:
+            return module_name, obj_name, True
+        if '.'.join([module_name, obj_name]) in ignore:  # check the name 'module.object'
+            return None
+        return module_name, obj_name, False
+
+    except AttributeError:
+        return None
+
+
+def _classify(name: str, obj, ignore: list[str], getmodule, memo: dict, reexports=None) -> ImportRecord | None:
+    """Returns the `ImportRecord` of a binding, or None if it should be skipped. Objects are identified once per `memo`."""
+    if name.startswith('__'):
+        return None
+
+    entry = memo.get(id(obj))
+    if entry is None or entry[0] is not obj:
+        entry = memo[id(obj)] = (obj, _identify(obj, ignore, getmodule, reexports))
+    if entry[1] is None or name in ignore or name.split('.')[-1] in ignore:
+        return None
+    module_name, obj_name, is_module = entry[1]
+
+    if is_module:  # this object is the module itself
+        return ImportRecord(obj_name, None, None if name == obj_name else name, 'module')
+    # this object is from this module
+    return ImportRecord(module_name, obj_name, None if name == obj_name else name, 'object')
+
+
+def _iter_records(items, ignore: list[str], getmodule, memo: dict, reexports=None):
+    """Yields the unique records of `(name, object)` pairs. Objects are identified once per `memo`."""
+    seen = set()  # records already yielded, when merging many frames
+    for name, obj in items:
+        record = _classify(name, obj, ignore, getmodule, memo, reexports)
+        if record is not None and record not in seen:
+            seen.add(record)
+            yield record
+
+
+def _reconstruct(items, max_obj: int, ignore: list[str], getmodule, memo: dict | None = None,
+                 reexports=None, stats=None) -> list[str]:
+    """Reconstructs the statements of `(name, object)` pairs. Objects are identified once per `memo`."""
+    if memo is None:
+        memo = {}
+    if stats is None:  # deduplicated by `format_imports` only
+        records = (_classify(name, obj, ignore, getmodule, memo, reexports) for name, obj in items)
+        return format_imports([record for record in records if record is not None], max_obj)
+    return _reconstruct_measured(items, max_obj, ignore, getmodule, memo, reexports, stats)
+
+
+def _reconstruct_measured(items, max_obj: int, ignore: list[str], getmodule, memo: dict, reexports,
+                          stats) -> list[str]:
+    """`_reconstruct` with the time of each phase and the counts of objects added to a `PhaseStats`."""
+    import time
+
+    getmodule = stats.timed_resolver(getmodule)
+    ignore = stats.timed_ignore(ignore)
+    start = time.perf_counter()
+    records = {}
+    scanned = skipped = 0
+    for name, obj in items:
+        scanned += 1
+        record = _classify(name, obj, ignore, getmodule, memo, reexports)
+        if record is None:
+            skipped += 1
+        else:
+            records[record] = None
+    stats.add('classify', time.perf_counter() - start - stats.flush(getmodule, ignore))
+    stats.count('objects_scanned', scanned)
+    stats.count('objects_skipped', skipped)
+    stats.count('records', len(records))
+
+    with stats.phase('format'):
+        return format_imports(records, max_obj)
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+# src/importlens/index.py
+"""A persistent index of the import statements in the source files of a repository."""
+import os
+import ast
+import time
+import hashlib
+import sqlite3
+import warnings
+import threading
+from typing import Iterator
+
+from .cache import default_cache_dir
+from .ignore import IgnoreMatcher
+from .static import _BATCH_SIZE, _iter_batches, _map_bounded, _package_of, iter_source_files, scan_source
+
+_PARALLEL_MIN_FILES = 256  # fewer changed files are scanned in this process
+_SCHEMA_VERSION = 2
+
+
+class ImportIndex:
+    """A SQLite index of the statements imported by each `.py` file under a directory, updated incrementally.
+
+    Each file is keyed by its path relative to `root` and the SHA-256 of its content. `update` stats all files,
+    hashes only those whose size or modification time changed, and scans only those whose content changed.
+    A file is also rescanned when its package changes, i.e., an `__init__.py` above it is added or removed,
+    since its relative imports are resolved against the package.
+    The statements are normalized the same way as `scan_source` and `inspect_imports`, e.g., by `max_obj`.
+    Changing `max_obj` or `ignore` rebuilds the index.
+
+    Args:
+        root (str): The directory to index.
+        path (str): The SQLite file. Defaults to a file in `default_cache_dir()` named after the absolute `root`.
+        max_obj (int): See `scan_source`. Defaults to 3.
+        ignore (list): See `scan_source`. Defaults to [].
+
+    Examples:
+        >>> from importlens import ImportIndex
+        >>> with ImportIndex('.') as index:
+        ...     index.update()
+        ...     print(index.importers('numpy'))
+        ...     print(index.statements())
+    """
+
+    def __init__(self, root: str, path: str | None = None, max_obj: int = 3, ignore: list[str] = []):
+        self.root = os.path.abspath(root)
+        if path is None:
+            os.makedirs(default_cache_dir(), exist_ok=True)
+            digest = hashlib.sha256(self.root.encode()).hexdigest()[:16]
+            path = os.path.join(default_cache_dir(), f"index-{digest}.sqlite3")
+        self.path = path
+        self.max_obj = max_obj
+        self.ignore = IgnoreMatcher.compile(ignore)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._check_options()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Closes the SQLite connection."""
+        self._connection.close()
+
+    def update(self, jobs: int | None = None) -> list[tuple[str, str]]:
+        """Rescans the files added or changed since the last update, and forgets the removed files.
+
+        Files that cannot be read or parsed are indexed without statements, with a warning.
+
+        Args:
+            jobs (int): The number of processes to scan many changed files. Defaults to `os.cpu_count()`.
+
+        Returns:
+            list: `(path, change)` of each file whose statements may have changed,
+                where change is 'added', 'modified' or 'removed'.
+        """
+        with self._lock:
+            known = {
+                path: (size, mtime, digest, package)
+                for path, size, mtime, digest, package in self._connection.execute(
+                    "SELECT path, size, mtime, hash, package FROM files"
+                )
+            }
+        packages = {}  # directory -> package, since adding or removing `__init__.py` changes the relative imports
+        changes = []
+        touched = []  # (relative path, size, mtime) of files with the same content
+        to_scan = []
+        for path in iter_source_files(self.root):
+            relpath = os.path.relpath(path, self.root)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            directory = os.path.dirname(path)
+            if directory not in packages:
+                packages[directory] = _package_of(path)
+            entry = known.pop(relpath, None)
+            if entry is not None and entry[3] == packages[directory]:
+                if entry[:2] == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                if _hash_file(path) == entry[2]:
+                    touched.append((stat.st_size, stat.st_mtime_ns, relpath))
+                    continue
+            to_scan.append(path)
+            changes.append((path, 'modified' if entry is not None else 'added'))
+        changes.extend((os.path.join(self.root, relpath), 'removed') for relpath in known)
+
+        with self._lock, self._connection:
+            self._connection.executemany("UPDATE files SET size = ?, mtime = ? WHERE path = ?", touched)
+            for relpath in known:
+                self._delete(relpath)
+        for results in _scan_files(to_scan, self.max_obj, self.ignore, jobs):
+            with self._lock, self._connection:
+                for path, size, mtime, digest, package, import_list, error in results:
+                    error and warnings.warn(UserWarning(f"Skipped '{path}'. {error}"))
+                    relpath = os.path.relpath(path, self.root)
+                    self._store(relpath, size, mtime, digest, package, import_list or [], error)
+        return changes
+
+    def watch(self, interval: float = 1.0, jobs: int | None = None) -> Iterator[list[tuple[str, str]]]:
+        """Updates the index every `interval` seconds and yields the changes of each update with any changes.
+
+        Runs until the caller stops iterating.
+
+        Examples:
+            >>> for changes in ImportIndex('.').watch():
+            ...     print(changes)
+        """
+        while True:
+            changes = self.update(jobs=jobs)
+            if changes:
+                yield changes
+            time.sleep(interval)
+
+    def importers(self, module_name: str) -> list[str]:
+        """Returns the sorted paths of the files importing a module, its submodules, or a name 'module.name'."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT DISTINCT path FROM modules WHERE module = ? OR module GLOB ? ORDER BY path",
+                (module_name, _escape_glob(module_name) + '.*')
+            ).fetchall()
+        return [os.path.join(self.root, path) for (path,) in rows]
+
+    def statements(self) -> list[str]:
+        """Returns all distinct statements in the indexed files, sorted as by `inspect_imports`."""
+        with self._lock:
+            rows = self._connection.execute("SELECT DISTINCT statement FROM statements").fetchall()
+        return sorted((statement for (statement,) in rows), key=lambda s: (s.startswith('from '), s.casefold()))
+
+    def imports_of(self, path: str) -> list[str]:
+        """Returns the statements of one indexed file."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT statement FROM statements WHERE path = ? ORDER BY position",
+                (os.path.relpath(os.path.abspath(path), self.root),)
+            ).fetchall()
+        return [statement for (statement,) in rows]
+
+    def errors(self) -> dict[str, str]:
+        """Returns `{path: error}` of the files that could not be read or parsed."""
+        with self._lock:
+            rows = self._connection.execute("SELECT path, error FROM files WHERE error != '' ORDER BY path").fetchall()
+        return {os.path.join(self.root, path): error for path, error in rows}
+
+    def clear(self) -> None:
+        """Forgets all files."""
+        with self._lock, self._connection:
+            for table in ('files', 'statements', 'modules'):
+                self._connection.execute(f"DELETE FROM {table}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def _check_options(self) -> None:
+        """Creates the tables, dropping those built with other options or by another version of the schema."""
+        options = repr((_SCHEMA_VERSION, self.root, self.max_obj, sorted(self.ignore)))
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT value FROM meta WHERE key = 'options'").fetchone()
+            if row is None or row[0] != options:
+                for table in ('files', 'statements', 'modules'):
+                    self._connection.execute(f"DROP TABLE IF EXISTS {table}")
+                self._connection.execute("INSERT OR REPLACE INTO meta VALUES ('options', ?)", (options,))
+            # `package` is the package the relative imports were resolved against, see `_package_of`
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, hash TEXT, package TEXT, error TEXT)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS statements (path TEXT, position INTEGER, statement TEXT)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS statements_path ON statements (path)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS statements_statement ON statements (statement)")
+            # Each module imported or imported from, and 'module.name' of each name imported from a module
+            self._connection.execute("CREATE TABLE IF NOT EXISTS modules (path TEXT, module TEXT)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS modules_path ON modules (path)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS modules_module ON modules (module)")
+
+    def _delete(self, relpath: str) -> None:
+        for table in ('files', 'statements', 'modules'):
+            self._connection.execute(f"DELETE FROM {table} WHERE path = ?", (relpath,))
+
+    def _store(self, relpath: str, size: int, mtime: int, digest: str, package: str, import_list: list[str],
+               error: str) -> None:
+        self._delete(relpath)
+        self._connection.execute(
+            "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)", (relpath, size, mtime, digest, package, error)
+        )
+        self._connection.executemany(
+            "INSERT INTO statements VALUES (?, ?, ?)", [(relpath, i, s) for i, s in enumerate(import_list)]
+        )
+        self._connection.executemany(
+            "INSERT INTO modules VALUES (?, ?)", [(relpath, m) for m in dict.fromkeys(_imported_modules(import_list))]
+        )
+
+
+def _hash_file(path: str) -> str | None:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _scan_files(paths: list[str], max_obj: int, ignore, jobs: int | None) -> Iterator[list[tuple]]:
+    """Yields the results of `_index_batch` batch by batch, in a process pool if there are many files."""
+    if len(paths) < _PARALLEL_MIN_FILES:
+        jobs = 1
+    yield from _map_bounded(_index_batch, _iter_batches(iter(paths), _BATCH_SIZE), jobs, max_obj, ignore)
+
+
+def _index_batch(paths: list[str], max_obj: int, ignore) -> list[tuple]:
+    """Returns `(path, size, mtime, hash, package, statements, error)` of each file, hashing the same bytes it scans."""
+    results = []
+    for path in paths:
+        package = _package_of(path)
+        try:
+            stat = os.stat(path)
+            with open(path, 'rb') as f:
+                source = f.read()
+        except OSError as e:
+            results.append((path, 0, 0, '', package, None, f"{type(e).__name__}: {e}"))
+            continue
+        digest = hashlib.sha256(source).hexdigest()
+        try:
+            import_list = scan_source(source, max_obj=max_obj, ignore=ignore, package=package, filename=path)
+            results.append((path, stat.st_size, stat.st_mtime_ns, digest, package, import_list, ''))
+        except (SyntaxError, ValueError) as e:  # `ValueError` for null bytes in the source
+            results.append((path, stat.st_size, stat.st_mtime_ns, digest, package, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _imported_modules(import_list: list[str]) -> Iterator[str]:
+    """Yields each module imported or imported from by the statements, and 'module.name' of each imported name."""
+    for import_str in import_list:
+        for node in ast.parse(import_str).body:
+            if isinstance(node, ast.Import):
+                yield from (alias.name for alias in node.names)
+            else:
+                module_name = '.' * node.level + (node.module or '')
+                yield module_name
+                yield from (f"{module_name}.{alias.name}" for alias in node.names if alias.name != '*')
+
+
+def _escape_glob(text: str) -> str:
+    """Escapes the special characters of SQLite GLOB."""
+    return ''.join(f"[{c}]" if c in '*?[' else c for c in text)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# src/importlens/lazy.py
+"""Functions to generate modules that import the reconstructed statements lazily."""
+import ast
+
+from .static import _parse_import
+from .verify import verify_imports
+
+_LAZY_TEMPLATE = '''# -*- coding: utf-8 -*-
+"""Lazy imports generated by importlens. Each name is imported on its first access."""
+
+# name -> (modules to import, module to bind)
+_modules = {modules}
+
+# name -> (module, attribute)
+_objects = {objects}
+
+# Modules imported by `from ... import *`, searched in order for the other names
+_wildcards = {wildcards}
+
+__all__ = {names}
+{invalid}
+
+def __getattr__(name):
+    import sys  # not bound in the module, where the names may be imported lazily
+    import importlib
+    if name in _modules:
+        modules, bound = _modules[name]
+        for module in modules:
+            importlib.import_module(module)
+        value = sys.modules[bound]
+    elif name in _objects:
+        module, attr = _objects[name]
+        try:
+            value = getattr(importlib.import_module(module), attr)
+        except AttributeError:  # a submodule not imported by its package
+            value = importlib.import_module(f"{{module}}.{{attr}}")
+    else:
+        for module in _wildcards:
+            module = importlib.import_module(module)
+            public = getattr(module, '__all__', [k for k in vars(module) if not k.startswith('_')])
+            if name in public:
+                value = getattr(module, name)
+                break
+        else:
+            raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+    globals()[name] = value  # imported only once
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+'''
+
+
+# Globals of the generated module, and those set on every module
+_RESERVED_NAMES = {
+    '_modules', '_objects', '_wildcards', '__all__', '__getattr__', '__dir__',
+    '__name__', '__doc__', '__file__', '__spec__', '__loader__', '__package__', '__cached__', '__builtins__',
+}
+
+
+def generate_lazy_module(import_list: list[str], verify=True, timeout=5, verbose=False) -> str:
+    """Generates the source of a module that imports the names bound by the statements on their first access.
+
+    The module defines a module-level `__getattr__` (PEP 562), so `lazy.np` or `from lazy import np` imports
+    `numpy` only at that point. Invalid statements are left out as comments.
+
+    Args:
+        import_list (list): Import statement strings, e.g., returned by `inspect_imports`.
+        verify (bool): Verify the statements by `verify_imports` first and leave out the invalid ones.
+            Defaults to True.
+        timeout (float): Seconds to wait for the verification. Defaults to 5.
+        verbose (bool): Print the progress of the verification. Defaults to False.
+
+    Returns:
+        str: Python source code.
+
+    Raises:
+        ValueError: If a statement is not an import statement, or binds a name the generated module defines
+            itself, e.g., `__getattr__` or `_modules`.
+
+    Examples:
+        >>> from importlens import inspect_imports, generate_lazy_module
+        >>> with open('lazy_imports.py', 'w') as f:
+        ...     f.write(generate_lazy_module(inspect_imports()))
+
+    **Limitations:**
+    1. Names imported by `from ... import *` are unknown until the module is imported.
+        They are found by importing the wildcard modules in order on the first access of an unknown name.
+    """
+    node_lists = [_parse_import(import_str) for import_str in import_list]
+    invalid_list = verify_imports(import_list, timeout=timeout, verbose=verbose) if verify else []
+    invalid_set = set(invalid_list)
+
+    modules = {}
+    objects = {}
+    wildcards = []
+    for import_str, nodes in zip(import_list, node_lists):
+        if import_str.strip() in invalid_set:
+            continue
+        for node in nodes:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.asname:
+                        modules[alias.asname] = ([alias.name], alias.name)
+                        continue
+                    # Binds the top-level package, with each submodule imported by the statements
+                    top = alias.name.split('.')[0]
+                    entry = modules.get(top)
+                    if entry is None or entry[1] != top:
+                        entry = modules[top] = ([], top)
+                    if alias.name not in entry[0]:
+                        entry[0].append(alias.name)
+            else:
+                for alias in node.names:
+                    if alias.name == '*':
+                        if node.module not in wildcards:
+                            wildcards.append(node.module)
+                    else:
+                        objects[alias.asname or alias.name] = (node.module, alias.name)
+
+    reserved = (modules.keys() | objects.keys()) & _RESERVED_NAMES
+    if reserved:
+        raise ValueError(f"Names defined by the generated module cannot be imported: {sorted(reserved)}")
+    return _LAZY_TEMPLATE.format(
+        modules=_format_dict(modules),
+        objects=_format_dict(objects),
+        wildcards=repr(wildcards),
+        names=repr(sorted(modules.keys() | objects.keys(), key=str.casefold)),
+        invalid=''.join(f"\n# Invalid: {s}" for s in invalid_list),
+    )
+
+
+def _format_dict(d: dict) -> str:
+    if not d:
+        return '{}'
+    return '{\n' + ''.join(f"    {k!r}: {v!r},\n" for k, v in d.items()) + '}'
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# src/importlens/reexport.py
+"""An index of the public modules that re-export each object."""
+import os
+import sys
+import json
+import atexit
+from types import ModuleType
+
+from .cache import default_cache_dir, environment_fingerprint
+
+
+def is_public(module_name: str) -> bool:
+    """Returns True if no part of the dotted module name starts with an underscore."""
+    return not any(part.startswith('_') for part in module_name.split('.'))
+
+
+class ReexportIndex:
+    """Maps each object to the shortest public module path that re-exports it.
+
+    The index is built once from the public modules in `sys.modules` and updated incrementally by `refresh`.
+    A module re-exports an object if it defines the object, lists the name in its `__all__`,
+    or has no `__all__` while the object is defined in a private module, e.g., `bisect` for `_bisect`.
+    Since only modules that are already imported are indexed, each located module is importable.
+
+    The located names can be saved to a JSON file by `save`, keyed by the environment fingerprint, and are
+    used for objects whose public module has not been imported in this process.
+    The index returned by `get_reexport_index` saves them when the interpreter exits.
+
+    Args:
+        path (str): The JSON file to load and save. Defaults to a file in `default_cache_dir()` named after
+            the environment fingerprint. If False, nothing is loaded or saved.
+    """
+
+    def __init__(self, path: str | bool | None = None):
+        if path is None:
+            path = os.path.join(default_cache_dir(), f"reexports-{environment_fingerprint()[:16]}.json")
+        self.path = path
+        self._exports = {}  # id(obj) -> (obj, set of (module name, attribute name))
+        self._indexed = {}  # module name -> (module, number of attributes indexed, [(id(obj), attribute name)])
+        self._all = {}  # module name -> set of names in `__all__`, or None if not defined
+        self._located = {}  # 'module:name' -> [public module, attribute], loaded and to be saved
+        self._memo = {}  # (id(obj), module name, name) -> located `(module, attribute)`, until the index changes
+        self._changed = False  # `_located` has entries not saved yet
+        if self.path:
+            try:
+                with open(self.path) as f:
+                    self._located = json.load(f)
+            except (OSError, ValueError):
+                pass
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Indexes the public modules that were added to `sys.modules` or have new attributes since the last call.
+
+        Modules removed from `sys.modules` are forgotten, so that the index does not keep their objects alive.
+        """
+        modules = sys.modules.copy()
+        n_indexed = len(self._indexed)
+        for name in [name for name, indexed in self._indexed.items() if modules.get(name) is not indexed[0]]:
+            self._forget(name)
+        changed = len(self._indexed) != n_indexed
+        for name, module in modules.items():
+            if not isinstance(module, ModuleType) or not is_public(name):
+                continue
+            attrs = vars(module)
+            indexed = self._indexed.get(name)
+            if indexed is not None and indexed[0] is module and indexed[1] == len(attrs):
+                continue
+            self._forget(name)  # the entries of removed or replaced attributes
+            changed = True
+            keys = []
+            for attr, obj in list(attrs.items()):
+                entry = self._exports.get(id(obj))
+                if entry is None or entry[0] is not obj:
+                    entry = self._exports[id(obj)] = (obj, set())
+                entry[1].add((name, attr))
+                keys.append((id(obj), attr))
+            all_names = attrs.get('__all__')
+            self._all[name] = set(all_names) if isinstance(all_names, (list, tuple, set)) else None
+            self._indexed[name] = (module, len(attrs), keys)
+        if changed:  # a shorter path may have been added, or a located one removed
+            self._memo.clear()
+
+    def locate(self, obj, module_name: str, obj_name: str) -> tuple[str, str]:
+        """Returns `(module, name)` to import an object defined in `module_name` as `obj_name` from.
+
+        Prefers the same name, then the fewest and shortest parts of the module path.
+        Returns `(module_name, obj_name)` if no public module is found.
+        The located names are kept until the next `refresh` that changes the index.
+        """
+        memo_key = (id(obj), module_name, obj_name)
+        located = self._memo.get(memo_key)
+        if located is not None:
+            module = sys.modules.get(located[0])
+            if isinstance(module, ModuleType) and vars(module).get(located[1]) is obj:  # not another object
+                return located
+        best = None
+        entry = self._exports.get(id(obj))
+        if entry is not None and entry[0] is obj:
+            for candidate, attr in entry[1]:
+                module = sys.modules.get(candidate)
+                if (
+                    not isinstance(module, ModuleType) or vars(module).get(attr) is not obj or
+                    not self._reexports(candidate, attr, module_name)
+                ):
+                    continue
+                key = (attr != obj_name, candidate.count('.'), len(candidate), candidate != module_name, candidate)
+                if best is None or key < best[0]:
+                    best = (key, candidate, attr)
+        name = f"{module_name}:{obj_name}"
+        if best is not None:
+            located = self._memo[memo_key] = best[1], best[2]
+            if located != (module_name, obj_name) and self._located.get(name) != list(located):
+                self._located[name] = list(located)
+                self._changed = True
+            return located
+        return tuple(self._located.get(name, (module_name, obj_name)))
+
+    def locate_module(self, module: ModuleType) -> tuple[str, str] | None:
+        """Returns `(module, name)` to import a module object from if it is not importable by its own name."""
+        if sys.modules.get(module.__name__) is module:
+            return None
+        entry = self._exports.get(id(module))
+        if entry is None or entry[0] is not module:
+            return None
+        candidates = [
+            (candidate, attr) for candidate, attr in entry[1]
+            if getattr(sys.modules.get(candidate), attr, None) is module
+        ]
+        return min(candidates, key=lambda c: (c[0].count('.'), len(c[0]), c), default=None)
+
+    def save(self, path: str | None = None) -> None:
+        """Saves the located names of the objects from private modules or under other names to a JSON file."""
+        path = path or self.path
+        if not path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self._located, f)
+        self._changed = False
+
+    def _forget(self, name: str) -> None:
+        """Removes the entries of a module, and the objects no other module exports."""
+        indexed = self._indexed.pop(name, None)
+        self._all.pop(name, None)
+        if indexed is None:
+            return
+        for key, attr in indexed[2]:
+            entry = self._exports.get(key)
+            if entry is None:
+                continue
+            entry[1].discard((name, attr))
+            if not entry[1]:
+                del self._exports[key]
+
+    def _reexports(self, candidate: str, attr: str, module_name: str) -> bool:
+        if candidate == module_name:
+            return True
+        all_names = self._all.get(candidate)
+        if all_names is not None:
+            return attr in all_names
+        return not is_public(module_name)
+
+
+_shared_index = None
+
+
+def get_reexport_index() -> ReexportIndex:
+    """Returns the process-wide index, refreshed against the current `sys.modules`."""
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = ReexportIndex()
+        atexit.register(_save_shared_index)
+    else:
+        _shared_index.refresh()
+    return _shared_index
+
+
+def _save_shared_index() -> None:
+    """Saves the names located by the process-wide index, if any were added."""
+    if _shared_index is not None and _shared_index._changed:
+        try:
+            _shared_index.save()
+        except OSError:
+            pass
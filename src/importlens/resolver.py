@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# src/importlens/resolver.py
+"""An indexed replacement for `inspect.getmodule`."""
+import sys
+import inspect
+from types import CodeType, FrameType, ModuleType, TracebackType
+
+# Objects without `__module__` that `inspect.getmodule` resolves through their source files
+_FILE_TYPES = (CodeType, FrameType, TracebackType)
+
+_MISSING = object()
+
+
+class ModuleResolver:
+    """Answers `inspect.getmodule(obj)` from an `id(obj)`-keyed index of module attributes.
+
+    The index is built once from `sys.modules` and updated incrementally by `refresh` when modules are added,
+    replaced or removed, or their number of attributes changes, so that removed attributes are not kept alive.
+    Objects that are not attributes of any module are resolved by the same rules as `inspect.getmodule`,
+    without walking `sys.modules` unless the object is a code object, frame or traceback.
+
+    **Limitations:**
+    1. The owner of an indexed object is read from its `__module__` at indexing time.
+        Reassigning `__module__` afterwards is not detected until the module is re-indexed.
+    2. An attribute replaced without changing the number of attributes of its module stays indexed,
+        and alive, until the module is re-indexed.
+    """
+
+    def __init__(self):
+        self._index = {}  # id(obj) -> (obj, module or module name)
+        self._ids_by_module = {}  # module name -> (module, list of indexed ids, number of attributes)
+        self._modules_size = -1
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Indexes the modules that were added to or replaced in `sys.modules` or changed size since the last call."""
+        if len(sys.modules) == self._modules_size and all(
+            sys.modules.get(name) is module and _count_attrs(module) == n_attrs
+            for name, (module, _, n_attrs) in self._ids_by_module.items()
+        ):
+            return
+
+        modules = sys.modules.copy()
+        for name in self._ids_by_module.keys() - modules.keys():
+            self._drop(name)
+        for name, module in modules.items():
+            indexed = self._ids_by_module.get(name)
+            if indexed is not None and indexed[0] is module and indexed[2] == _count_attrs(module):
+                continue
+            if indexed is not None:
+                self._drop(name)
+            self._add(name, module)
+        self._modules_size = len(modules)
+
+    def getmodule(self, obj) -> ModuleType | None:
+        """Returns the module `obj` is defined in, or None if not found. Same as `inspect.getmodule(obj)`."""
+        entry = self._index.get(id(obj))
+        if entry is not None and entry[0] is obj:
+            owner = entry[1]
+            return sys.modules.get(owner) if isinstance(owner, str) else owner
+
+        if isinstance(obj, ModuleType):
+            return obj
+        module_name = getattr(obj, '__module__', _MISSING)
+        if module_name is _MISSING:
+            # `inspect.getmodule` only finds a file for these types, the rest raise `TypeError` and return None
+            return inspect.getmodule(obj) if isinstance(obj, _FILE_TYPES) else None
+        return sys.modules.get(module_name)
+
+    def _add(self, name: str, module) -> None:
+        ids = []
+        try:
+            attrs = vars(module)
+        except TypeError:  # not a real module, e.g., a placeholder set to None
+            attrs = {}
+        n_attrs = _count_attrs(module)
+        for obj in list(attrs.values()):
+            if isinstance(obj, ModuleType):
+                owner = obj
+            else:
+                try:
+                    owner = obj.__module__
+                except Exception:
+                    continue
+                if not isinstance(owner, str):
+                    continue
+            self._index[id(obj)] = (obj, owner)
+            ids.append(id(obj))
+        self._ids_by_module[name] = (module, ids, n_attrs)
+
+    def _drop(self, name: str) -> None:
+        # Objects shared with other modules are dropped too, they fall back to the exact rules in `getmodule`
+        _, ids, _ = self._ids_by_module.pop(name)
+        for obj_id in ids:
+            self._index.pop(obj_id, None)
+
+
+def _count_attrs(module) -> int:
+    """Returns the number of attributes of a module, or -1 if it has no `__dict__`."""
+    try:
+        return len(vars(module))
+    except TypeError:
+        return -1
+
+
+_shared_resolver = None
+
+
+def get_resolver() -> ModuleResolver:
+    """Returns the process-wide resolver, refreshed against the current `sys.modules`."""
+    global _shared_resolver
+    if _shared_resolver is None:
+        _shared_resolver = ModuleResolver()
+    else:
+        _shared_resolver.refresh()
+    return _shared_resolver
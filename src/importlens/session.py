@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# src/importlens/session.py
+"""A stateful inspector that only reprocesses the changed bindings."""
+import sys
+
+from .importlens import (
+    _classify, _compile_ignore, _frame_namespace, _get_module_resolver, _get_reexport_index, format_imports
+)
+
+
+class ImportSession:
+    """Reconstructs the import statements of a namespace repeatedly, e.g., after every cell in a REPL or Jupyter.
+
+    The previous scan is kept by `(name, id(obj))`. Each `update` only classifies the names that were added,
+    removed or rebound since the last call, and patches the grouped statements. The statements are the same as
+    those of `inspect_imports`, except that the names in `from ... import ...` keep the order they were first seen.
+    All bindings are classified again after new modules are imported, since objects may then be located in
+    other public modules.
+
+    Args:
+        max_obj (int): See `inspect_imports`. Defaults to 3.
+        ignore (list): See `inspect_imports`. Defaults to [].
+
+    Examples:
+        In IPython:
+        >>> from importlens import ImportSession
+        >>> session = ImportSession()
+        >>> get_ipython().events.register('post_run_cell', lambda result: print(session.update(get_ipython().user_ns)))
+    """
+
+    def __init__(self, max_obj: int = 3, ignore: list[str] = []):
+        self.max_obj = max_obj
+        self.ignore = _compile_ignore(ignore)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._bindings = {}  # name -> (obj, record returned by `_classify`)
+        self._counts = {}  # record -> number of bindings, in the order first seen
+        self._statements = []
+        self._modules_size = len(sys.modules)
+        self._dirty = True
+        self.changes = 0  # number of names classified by the last update
+
+    def update(self, namespace: dict | None = None) -> list[str]:
+        """Applies the changes in the namespace and returns the import statements.
+
+        Args:
+            namespace (dict): The namespace to inspect. Defaults to None, in which case all objects
+                in the caller's frame are inspected like `inspect_imports`.
+
+        Returns:
+            list: Import statement strings.
+        """
+        if namespace is None:
+            namespace = _frame_namespace(sys._getframe(1))
+        if len(sys.modules) != self._modules_size:
+            self._reset()
+
+        getmodule = _get_module_resolver()
+        reexports = _get_reexport_index()
+        memo = {}
+        bindings = self._bindings
+        changes = 0
+
+        for name in bindings.keys() - namespace.keys():  # removed
+            self._discard(bindings.pop(name)[1])
+            changes += 1
+        for name, obj in namespace.items():
+            entry = bindings.get(name)
+            if entry is not None and entry[0] is obj:  # unchanged
+                continue
+            if entry is not None:  # rebound
+                self._discard(entry[1])
+            record = _classify(name, obj, self.ignore, getmodule, memo, reexports)
+            bindings[name] = (obj, record)
+            self._add(record)
+            changes += 1
+
+        self.changes = changes
+        if self._dirty:
+            self._statements = format_imports(self._counts, self.max_obj)
+            self._dirty = False
+        return list(self._statements)
+
+    def reset(self) -> None:
+        """Forgets the previous scan, so that the next update classifies all bindings."""
+        self._reset()
+
+    def records(self) -> list:
+        """Returns the `ImportRecord` of each imported name as of the last update, in the order first seen."""
+        return list(self._counts)
+
+    def _add(self, record) -> None:
+        if record is None:
+            return
+        count = self._counts.get(record, 0)
+        self._counts[record] = count + 1
+        if count == 0:
+            self._dirty = True
+
+    def _discard(self, record) -> None:
+        if record is None:
+            return
+        count = self._counts[record] - 1
+        if count > 0:
+            self._counts[record] = count  # keeps the order
+            return
+        del self._counts[record]
+        self._dirty = True
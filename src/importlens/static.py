@@ -0,0 +1,468 @@
+# -*- coding: utf-8 -*-
+# src/importlens/static.py
+"""Functions to extract the import statements from source files without executing them."""
+import os
+import ast
+import sys
+import warnings
+import threading
+import importlib.machinery
+from collections import deque
+from functools import lru_cache
+from typing import Iterator
+
+from .importlens import _compile_ignore, _format_statements, _is_ignored, module_mapping
+
+# Directories that never contain project sources. Hidden directories are skipped as well.
+_SKIPPED_DIRS = {'__pycache__', 'node_modules', 'site-packages', 'venv'}
+
+# Attributes set on every module by the import system, and on the modules loaded from files and packages
+_MODULE_ATTRS = {'__name__', '__doc__', '__spec__', '__loader__', '__package__'}
+_FILE_ATTRS = {'__file__', '__cached__'}
+_PACKAGE_ATTRS = {'__path__'}
+
+_EXTENSION_SUFFIXES = tuple(importlib.machinery.EXTENSION_SUFFIXES)
+
+# Nodes with their own scopes, whose names are not bound in the module
+_SCOPE_NODES = (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+# Statements whose bodies may not run, e.g., `if __name__ == '__main__':`, version branches and `try` blocks
+_BRANCH_NODES = (ast.If, ast.Try, ast.For, ast.AsyncFor, ast.While, ast.Match) + (
+    (ast.TryStar,) if hasattr(ast, 'TryStar') else ()
+)
+
+_BATCH_SIZE = 64  # files per task in the process pool
+
+
+def scan_source(source: str | bytes, max_obj: int = 3, ignore: list[str] = [], package: str | None = None,
+                filename: str = '<unknown>') -> list[str]:
+    """Parses the source code and reconstructs the statements of all its imports, without executing it.
+
+    The statements are normalized the same way as `inspect_imports`.
+
+    Args:
+        source (str or bytes): Python source code.
+        max_obj (int): If more than `max_obj` are imported from a module, they will be represented as a wildcard,
+            i.e., `from ... import *`. Defaults to 3.
+        ignore (list): Modules or objects, including aliases, to be ignored. Defaults to [].
+            Patterns are accepted as in `inspect_imports`.
+        package (str): The package of the source, used to resolve relative imports. Defaults to None,
+            in which case relative imports are kept as they are.
+        filename (str): The file name shown in syntax errors. Defaults to '<unknown>'.
+
+    Returns:
+        list: Import statement strings.
+
+    Raises:
+        SyntaxError: If the source cannot be parsed.
+
+    **Limitations:**
+    1. Without importing the modules, `from a import b` is kept as it is even if `b` is a submodule,
+        and `import a.b` is kept as it is rather than `import a`.
+    2. Imports in all scopes of the source are included, as well as those never executed.
+    """
+    tree = ast.parse(source, filename)
+    ignore = _compile_ignore(ignore)
+
+    imports = {}
+    wildcard_modules = set()
+    regular_import_str_list = []
+    specific_import_str_list = []
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                module_name = alias.name
+                name = alias.asname or module_name.split('.')[0]
+                if (
+                    module_name.startswith('__') or name.startswith('__') or
+                    _is_ignored(module_name, module_name, name, ignore)
+                ):
+                    continue
+                if alias.asname and alias.asname != module_name:  # is an alias
+                    import_str = f"import {module_name} as {alias.asname}"
+                else:
+                    import_str = f"import {module_name}"
+                if import_str not in regular_import_str_list:
+                    regular_import_str_list.append(import_str)
+
+        elif isinstance(node, ast.ImportFrom):
+            module_name = _resolve_module_name(node.module, node.level, package)
+            module_name = module_mapping.get(module_name, module_name)
+            if module_name.startswith('__'):
+                continue
+            for alias in node.names:
+                obj_name = alias.name
+                if obj_name == '*':
+                    if not _is_ignored(module_name, '', '', ignore):
+                        wildcard_modules.add(module_name)
+                    continue
+                name = alias.asname or obj_name
+                if (
+                    name.startswith('__') or
+                    _is_ignored(module_name, obj_name, name, ignore) or
+                    '.'.join([module_name, obj_name]) in ignore
+                ):
+                    continue
+                if name != obj_name:  # is an alias
+                    import_str = f"from {module_name} import {obj_name} as {name}"
+                    if import_str not in specific_import_str_list:
+                        specific_import_str_list.append(import_str)
+                elif name not in imports.setdefault(module_name, []):
+                    imports[module_name].append(name)
+
+    # A wildcard import already includes the other names from the module
+    for module_name in wildcard_modules:
+        imports.pop(module_name, None)
+        specific_import_str_list.append(f"from {module_name} import *")
+
+    return _format_statements(regular_import_str_list, specific_import_str_list, imports, max_obj)
+
+
+def scan_file(path: str, max_obj: int = 3, ignore: list[str] = [], package: str | None = None) -> list[str]:
+    """Reconstructs the statements of all imports in a `.py` file without executing it. See `scan_source`.
+
+    If `package` is None, it is found from the `__init__.py` files in the parent directories.
+    """
+    with open(path, 'rb') as f:
+        source = f.read()
+    if package is None:
+        package = _package_of(path)
+    return scan_source(source, max_obj=max_obj, ignore=ignore, package=package, filename=path)
+
+
+def scan_tree(root: str, max_obj: int = 3, ignore: list[str] = [],
+              jobs: int | None = None) -> Iterator[tuple[str, list[str]]]:
+    """Scans all `.py` files under `root` in parallel and yields `(path, statements)` file by file.
+
+    Files are yielded in the order they are found. Files that cannot be read or parsed are skipped with a warning.
+
+    Args:
+        root (str): A directory or a `.py` file.
+        max_obj (int): See `scan_source`. Defaults to 3.
+        ignore (list): See `scan_source`. Defaults to [].
+        jobs (int): The number of processes. Defaults to `os.cpu_count()`. If 1, files are scanned in this process.
+
+    Examples:
+        >>> from importlens import scan_tree
+        >>> for path, import_list in scan_tree('.'):
+        ...     print(path, import_list)
+    """
+    ignore = _compile_ignore(ignore)
+    batches = _iter_batches(iter_source_files(root), _BATCH_SIZE)
+    for results in _map_bounded(_scan_batch, batches, jobs, max_obj, ignore):
+        yield from _report(results)
+
+
+def iter_source_files(root: str) -> Iterator[str]:
+    """Yields the paths of all `.py` files under `root`, skipping hidden and environment directories."""
+    if os.path.isfile(root):
+        yield root
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d not in _SKIPPED_DIRS)
+        for filename in sorted(filenames):
+            if filename.endswith('.py'):
+                yield os.path.join(dirpath, filename)
+
+
+def check_import(import_str: str) -> bool | None:
+    """Checks an import statement without executing any module code.
+
+    Modules are found by the finders in `sys.meta_path`, the same way as `importlib.util.find_spec`
+    but without importing the parent packages. A name in `from ... import name` is valid if it is a submodule,
+    or is bound at the top level of the module source, e.g., by an assignment, a definition or an import,
+    outside of branches that may not run, e.g., `if`, `try` or `for` blocks, and not deleted by `del`.
+    Other names cannot be decided, since modules may bind names in ways their sources do not show.
+    Modules without sources are only checked if they are already imported in this process.
+
+    Args:
+        import_str (str): An import statement string.
+
+    Returns:
+        bool: True if valid, False if a module is not found, or None if it cannot be decided without executing
+            the imports, e.g., a relative import, or a name not found in the module source.
+
+    **Limitations:**
+    1. The modules are found on the `sys.path` of this process, which can differ from that of a new Python process.
+        So `verify_imports` only trusts True.
+    """
+    try:
+        nodes = ast.parse(import_str.strip()).body
+    except SyntaxError:
+        return None
+
+    result = True
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            checks = [(alias.name, None) for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            checks = [(node.module, alias.name) for alias in node.names]
+        else:
+            return None
+        for module_name, name in checks:
+            valid = _check_module(module_name) if name is None else _check_name(module_name, name)
+            if valid is False:
+                return False
+            if valid is None:
+                result = None
+    return result
+
+
+def _find_spec(module_name: str):
+    """Returns the spec of a module, False if it is definitely not found, or None if it cannot be decided."""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return getattr(module, '__spec__', None)
+
+    parent, _, _ = module_name.rpartition('.')
+    path = None
+    if parent:
+        parent_spec = _find_spec(parent)
+        if not parent_spec:
+            return parent_spec
+        path = parent_spec.submodule_search_locations
+        if path is None:  # not a package, but its submodules may be set in `sys.modules`, e.g., `os.path`
+            return None
+
+    for finder in sys.meta_path:
+        find_spec = getattr(finder, 'find_spec', None)
+        if find_spec is None:
+            continue
+        try:
+            spec = find_spec(module_name, path)
+        except Exception:
+            return None
+        if spec is not None:
+            return spec
+    if parent and _module_names(parent, parent_spec)[2]:  # the package may set its submodules when imported
+        return None
+    return False
+
+
+def _check_module(module_name: str) -> bool | None:
+    spec = _find_spec(module_name)
+    return True if spec else spec
+
+
+def _check_name(module_name: str, name: str) -> bool | None:
+    spec = _find_spec(module_name)
+    if not spec:
+        return spec
+    if name == '*' or name in _MODULE_ATTRS:
+        return True
+    module = sys.modules.get(module_name)
+    if module is not None and name in vars(module):  # already imported, without calling `__getattr__`
+        return True
+    if module is None and name in _FILE_ATTRS and spec.has_location and spec.origin.endswith('.py'):
+        return True
+    if module is None and name in _PACKAGE_ATTRS and spec.submodule_search_locations is not None:
+        return True
+    if spec.submodule_search_locations is not None and _find_spec(f"{module_name}.{name}"):
+        return True
+    names, _, _, _ = _module_names(module_name, spec)
+    if names is not None and name in names:
+        return True
+    # Not proven missing, since modules may bind names in ways not visible in their sources,
+    # e.g., `_IntEnum._convert_` of `ssl` or `__annotations__`
+    return None
+
+
+def _module_names(module_name: str, spec) -> tuple:
+    """Returns `(names, __all__, dynamic, uncertain)` of a module, where names is None if unknown,
+    `__all__` is None if not defined or False if not a literal,
+    and uncertain are the names that may or may not be bound, e.g., only in an `if` block."""
+    origin = spec.origin
+    if origin and origin.endswith('.py'):
+        package = module_name if spec.submodule_search_locations is not None else module_name.rpartition('.')[0]
+        try:
+            return _source_names(origin, os.stat(origin).st_mtime_ns, package)
+        except OSError:
+            return None, None, True, frozenset()
+    if origin is None and spec.submodule_search_locations is not None:  # a namespace package
+        return frozenset(), None, False, frozenset()
+    module = sys.modules.get(module_name)
+    if module is not None and (
+        origin in ('built-in', 'frozen') or (origin or '').endswith(_EXTENSION_SUFFIXES)
+    ):  # builtin and extension modules already imported, which bind their names once
+        all_names = getattr(module, '__all__', None)
+        return frozenset(vars(module)), None if all_names is None else frozenset(all_names), False, frozenset()
+    return None, None, True, frozenset()
+
+
+_local = threading.local()  # `resolving`: source files being analyzed, to stop at circular wildcard imports
+
+
+@lru_cache(maxsize=256)
+def _source_names(path: str, mtime: int, package: str) -> tuple:
+    """Returns `(names, __all__, dynamic, uncertain)` of a source file. See `_module_names`.
+
+    Names bound at the top level outside of branches are collected, and the names of `from ... import *`
+    are followed statically.
+    """
+    try:
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), path)
+    except (SyntaxError, ValueError):
+        return None, None, True, frozenset()
+
+    names = set()
+    uncertain = set()  # bound in branches, or declared `global` in functions
+    deleted = set()
+    stars = []  # (module, in a branch)
+    all_names = None
+    dynamic = False
+    stack = [(tree, False)]
+    while stack:
+        node, in_branch = stack.pop()
+        bound = uncertain if in_branch else names
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound.add(node.name)
+            continue
+        if isinstance(node, _SCOPE_NODES):
+            continue
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            bound.add(node.id)
+        elif isinstance(node, ast.Delete):
+            deleted.update(target.id for target in node.targets if isinstance(target, ast.Name))
+        elif isinstance(node, ast.ExceptHandler) and node.name:  # `except ... as name` deletes the name after
+            deleted.add(node.name)
+        elif isinstance(node, ast.Import):
+            bound.update(alias.asname or alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name == '*':
+                    stars.append((_resolve_module_name(node.module, node.level, package), in_branch))
+                else:
+                    bound.add(alias.asname or alias.name)
+        in_branch = in_branch or isinstance(node, _BRANCH_NODES)
+        stack.extend((child, in_branch) for child in ast.iter_child_nodes(node))
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Global):
+            uncertain.update(node.names)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in ('globals', 'vars', 'exec'):
+            dynamic = True
+        elif (
+            isinstance(node, ast.Subscript) and isinstance(node.ctx, ast.Store) and
+            isinstance(node.value, ast.Attribute) and node.value.attr == 'modules'
+        ):  # `sys.modules[...] = ...`
+            dynamic = True
+        elif isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == '__all__' for t in node.targets):
+            try:
+                value = ast.literal_eval(node.value)
+                all_names = frozenset(value) if all_names is None and isinstance(value, (list, tuple)) else False
+            except ValueError:
+                all_names = False
+        elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name) and node.target.id == '__all__':
+            all_names = False
+        elif isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == '__all__':
+            all_names = False  # `__all__.extend(...)`
+
+    resolving = getattr(_local, 'resolving', None)
+    if resolving is None:  # in each thread, e.g., of `averify_imports`
+        resolving = _local.resolving = set()
+    resolving.add(path)
+    try:
+        for star, in_branch in stars:
+            star_spec = _find_spec(star) if not star.startswith('.') else None
+            star_names = (None, None, True, frozenset())
+            if star_spec and star_spec.origin not in resolving:
+                star_names = _module_names(star, star_spec)
+            if star_names[0] is None or star_names[1] is False:
+                dynamic = True
+                continue
+            public = star_names[1] or {n for n in star_names[0] if not n.startswith('_')}
+            (uncertain if in_branch else names).update(public)
+            uncertain.update(n for n in star_names[3] if (n in star_names[1] if star_names[1] else n[:1] != '_'))
+            dynamic = dynamic or star_names[2]
+    finally:
+        resolving.discard(path)
+    names = frozenset(names - deleted)  # may be rebound after `del`, but not surely
+    uncertain = frozenset((uncertain | deleted) - names)
+    return names, all_names, dynamic or '__getattr__' in names or '__getattr__' in uncertain, uncertain
+
+
+def _parse_import(import_str: str) -> list[ast.Import | ast.ImportFrom]:
+    """Parses one or more absolute import statements."""
+    try:
+        nodes = ast.parse(import_str.strip()).body
+    except SyntaxError as e:
+        raise ValueError(f"Not an import statement: {import_str!r}") from e
+    for node in nodes:
+        if not isinstance(node, (ast.Import, ast.ImportFrom)) or getattr(node, 'level', 0):
+            raise ValueError(f"Not an absolute import statement: {import_str!r}")
+    return nodes
+
+
+def _resolve_module_name(module: str | None, level: int, package: str | None) -> str:
+    """Resolves the module name of `from {'.' * level}{module} import ...`."""
+    if level == 0:
+        return module
+    bits = package.rsplit('.', level - 1) if package else []
+    if len(bits) < level:  # unknown or beyond the top-level package
+        return '.' * level + (module or '')
+    return f"{bits[0]}.{module}" if module else bits[0]
+
+
+def _package_of(path: str) -> str:
+    """Returns the dotted package of a file from the `__init__.py` files in its parent directories."""
+    parts = []
+    directory = os.path.dirname(os.path.abspath(path))
+    while os.path.isfile(os.path.join(directory, '__init__.py')):
+        directory, name = os.path.split(directory)
+        parts.append(name)
+    return '.'.join(reversed(parts))
+
+
+def _iter_batches(paths: Iterator[str], size: int) -> Iterator[list[str]]:
+    batch = []
+    for path in paths:
+        batch.append(path)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _map_bounded(fn, items, jobs: int | None, *args, **kwargs) -> Iterator:
+    """Yields `fn(item, *args, **kwargs)` of each item in order, from a pool of `jobs` processes.
+
+    At most `jobs * 4` items are in flight so that the results stream with bounded memory.
+    If `jobs` is 1, the items are processed in this process.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        for item in items:
+            yield fn(item, *args, **kwargs)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor  # imports `multiprocessing`, only needed here
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(fn, item, *args, **kwargs))
+            if len(pending) >= jobs * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _scan_batch(paths: list[str], max_obj: int, ignore: list[str]) -> list[tuple[str, list[str] | None, str]]:
+    """Scans the files and returns `(path, statements, error)` for each, where statements is None on errors."""
+    results = []
+    for path in paths:
+        try:
+            results.append((path, scan_file(path, max_obj=max_obj, ignore=ignore), ''))
+        except (SyntaxError, ValueError, OSError) as e:  # `ValueError` for null bytes in the source
+            results.append((path, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _report(results: list[tuple[str, list[str] | None, str]]) -> Iterator[tuple[str, list[str]]]:
+    for path, import_list, error in results:
+        if import_list is None:
+            warnings.warn(UserWarning(f"Skipped '{path}'. {error}"))
+        else:
+            yield path, import_list
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# src/importlens/stats.py
+"""Per-phase timings and counters of `inspect_imports` and `verify_imports`."""
+import time
+from contextlib import contextmanager
+
+from .importlens import _is_ignored
+
+
+class PhaseStats:
+    """Accumulates the time spent in each phase and counts of what was processed, across calls.
+
+    Pass it as `stats` to `inspect_imports`, `inspect_frames`, `inspect_stack`, `inspect_threads` or
+    `verify_imports`. Without `stats`, nothing is measured.
+
+    Phases of inspecting:
+        'capture': Reading the frames and merging their globals and locals.
+        'resolve': Finding the module of each object by `getmodule`.
+        'ignore': Matching the modules, objects and names against `ignore`.
+        'classify': The rest of turning the bindings into records, e.g., finding the re-exporting modules.
+        'format': Grouping, formatting and sorting the statements.
+
+    Phases of verifying:
+        'cache': Looking up the results in the `cache`.
+        'static': Checking the statements by `check_import`.
+        'spawn': Starting the Python process.
+        'execute': Running the statements, in the new process including its startup, or in the `worker`.
+        'parse': Parsing the output and merging the results.
+
+    Counters:
+        'objects_scanned', 'objects_skipped' (not imported or ignored), 'objects_resolved' (by `getmodule`),
+        'records', 'statements', 'statements_cached', 'statements_static', 'statements_executed',
+        'statements_invalid'.
+
+    Args:
+        callback (callable): Called as `callback(phase, seconds)` at the end of each phase. Defaults to None.
+
+    Attributes:
+        seconds (dict): {phase: total seconds}.
+        counts (dict): {counter: total count}.
+
+    Examples:
+        >>> from importlens import PhaseStats, inspect_imports
+        >>> stats = PhaseStats()
+        >>> import_list = inspect_imports(stats=stats)
+        >>> print(stats)
+    """
+
+    __slots__ = ('seconds', 'counts', 'callback')
+
+    def __init__(self, callback=None):
+        self.seconds = {}
+        self.counts = {}
+        self.callback = callback
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Adds the time of a phase."""
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        if self.callback is not None:
+            self.callback(phase, seconds)
+
+    def count(self, counter: str, n: int = 1) -> None:
+        """Adds to a counter."""
+        self.counts[counter] = self.counts.get(counter, 0) + n
+
+    @contextmanager
+    def phase(self, phase: str):
+        """Measures the time of the block as a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    def timed_resolver(self, getmodule):
+        """Returns a function timing and counting the calls of `getmodule`. Reported by `flush`."""
+        return _TimedResolver(getmodule)
+
+    def timed_ignore(self, ignore):
+        """Returns a container timing the matches of `ignore`. Reported by `flush`."""
+        return _TimedIgnore(ignore)
+
+    def flush(self, *timers) -> float:
+        """Adds the time and counts of timers from `timed_resolver` and `timed_ignore`, and returns their total time."""
+        total = 0.0
+        for timer in timers:
+            total += timer.seconds
+            self.add(timer.phase, timer.seconds)
+            if isinstance(timer, _TimedResolver):
+                self.count('objects_resolved', timer.resolved)
+                timer.resolved = 0
+            timer.seconds = 0.0
+        return total
+
+    def reset(self) -> None:
+        """Clears all timings and counters."""
+        self.seconds.clear()
+        self.counts.clear()
+
+    def as_dict(self) -> dict:
+        """Returns `{'seconds': {...}, 'counts': {...}}`, e.g., to dump as JSON."""
+        return {'seconds': dict(self.seconds), 'counts': dict(self.counts)}
+
+    def __str__(self) -> str:
+        lines = [f"{phase:<10} {seconds * 1000:10.3f} ms" for phase, seconds in self.seconds.items()]
+        lines += [f"{counter:<20} {n:8d}" for counter, n in self.counts.items()]
+        return '\n'.join(lines)
+
+    def __repr__(self) -> str:
+        return f"PhaseStats(seconds={self.seconds!r}, counts={self.counts!r})"
+
+
+class _TimedResolver:
+    __slots__ = ('getmodule', 'seconds', 'resolved')
+    phase = 'resolve'
+
+    def __init__(self, getmodule):
+        self.getmodule = getmodule
+        self.seconds = 0.0
+        self.resolved = 0
+
+    def __call__(self, obj):
+        start = time.perf_counter()
+        module = self.getmodule(obj)
+        self.seconds += time.perf_counter() - start
+        if module:
+            self.resolved += 1
+        return module
+
+
+class _TimedIgnore:
+    """Wraps an `IgnoreMatcher` or a plain list, keeping the interface `_is_ignored` expects of either."""
+    __slots__ = ('ignore', 'seconds')
+    phase = 'ignore'
+
+    def __init__(self, ignore):
+        self.ignore = ignore
+        self.seconds = 0.0
+
+    def matches(self, module_name: str, obj_name: str, name: str) -> bool:
+        start = time.perf_counter()
+        matched = _is_ignored(module_name, obj_name, name, self.ignore)
+        self.seconds += time.perf_counter() - start
+        return matched
+
+    def __contains__(self, name: str) -> bool:
+        start = time.perf_counter()
+        matched = name in self.ignore
+        self.seconds += time.perf_counter() - start
+        return matched
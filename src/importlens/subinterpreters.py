@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# src/importlens/subinterpreters.py
+"""Verifies the reconstructed statements in subinterpreters of this process, on Python 3.12 and later."""
+import sys
+import json
+import atexit
+import tempfile
+import threading
+import subprocess
+
+from .worker import get_verifier_worker
+
+try:
+    if sys.version_info < (3, 12):  # extension modules are not checked for subinterpreter support before 3.12
+        raise ImportError
+    try:
+        import _interpreters as _xi  # 3.13+
+    except ImportError:
+        import _xxsubinterpreters as _xi
+except ImportError:
+    _xi = None
+
+# Runs in a new isolated interpreter with `statements` (JSON) and `fd` (a file to write to) in its globals.
+# Writes one JSON line `[status, statement]` for each statement that is not valid, where status is
+# 'invalid', or 'unsupported' if an extension module cannot be loaded in subinterpreters.
+_SUBINTERPRETER_PROGRAM = r"""# Imports each statement
+import os
+import json
+
+for import_str in json.loads(statements):
+    try:
+        exec(import_str, {})
+    except ImportError as e:
+        status = 'unsupported' if 'subinterpreter' in str(e) else 'invalid'
+        os.write(fd, (json.dumps([status, import_str]) + '\n').encode())
+    except Exception:
+        pass
+"""
+
+
+class SubinterpreterPool:
+    """Verifies import statements in isolated subinterpreters of this process instead of new Python processes.
+
+    Each batch runs in a fresh subinterpreter with its own `sys.modules`, which is destroyed afterwards,
+    so the imports leave nothing in the caller or the next batch. Up to `size` subinterpreters are created
+    in advance by a background thread to hide their startup. Pass the pool as the `worker` of `verify_imports`.
+
+    Statements importing extension modules that cannot be loaded in subinterpreters, and all statements
+    before Python 3.12, are verified by the `fallback` worker in a separate process instead.
+
+    Args:
+        size (int): The number of subinterpreters to keep ready. Defaults to 2.
+        fallback (VerifierWorker): Defaults to None, in which case the process-wide worker of `sys.executable`
+            is started on first use.
+
+    Attributes:
+        available (bool): True if subinterpreters are used.
+        fallbacks (int): The number of statements verified by the `fallback`.
+
+    Examples:
+        >>> from importlens import SubinterpreterPool, verify_imports
+        >>> with SubinterpreterPool() as pool:
+        ...     invalid_list = verify_imports(["import os", "import dummy"], worker=pool)
+
+    **Limitations:**
+    1. A subinterpreter cannot be interrupted. After a timeout, it keeps running in a background thread
+        and the process waits for it at exit.
+    2. A statement that crashes the interpreter, e.g., by a faulty extension module, crashes this process.
+    """
+
+    def __init__(self, size: int = 2, fallback=None):
+        self.size = size
+        self.available = _xi is not None
+        self.fallbacks = 0
+        self._fallback = fallback
+        self._idle = []  # ids of the subinterpreters created in advance
+        self._running = {}  # thread -> (id, output file) of a subinterpreter abandoned after a timeout
+        self._lock = threading.Lock()
+        self._filler = None  # the thread creating subinterpreters
+        self._closed = False
+        if self.available:
+            atexit.register(self.close)
+            self._fill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Destroys the subinterpreters, waiting for those still running."""
+        with self._lock:
+            self._closed = True
+            filler = self._filler
+        if filler is not None:
+            filler.join()
+        with self._lock:
+            idle, self._idle = self._idle, []
+            running, self._running = self._running, {}
+        for thread, (interp, f) in running.items():
+            thread.join()
+            f.close()
+            idle.append(interp)
+        for interp in idle:
+            _xi.destroy(interp)
+
+    def verify(self, import_list: list[str], timeout=5) -> list[str]:
+        """Verifies the import statements and returns a list of invalid ones. See `VerifierWorker.verify`.
+
+        Raises:
+            subprocess.TimeoutExpired: If the statements are not verified within `timeout` seconds.
+        """
+        import_list = [s.strip() for s in import_list]
+        if not import_list:
+            return []
+        if not self.available:
+            return self._verify_fallback(import_list, timeout)
+
+        interp = self._acquire()
+        reply = {}
+        f = tempfile.TemporaryFile()
+        thread = threading.Thread(target=self._run, args=(interp, import_list, f.fileno(), reply), daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            with self._lock:
+                self._running[thread] = (interp, f)  # cannot be stopped, destroyed by `close`
+            raise subprocess.TimeoutExpired('subinterpreter', timeout)
+        _xi.destroy(interp)
+        self._fill()
+        with f:
+            f.seek(0)
+            statuses = dict(reversed(json.loads(line)) for line in f.read().decode().splitlines())
+
+        if reply.get('error') is not None:  # failed as a whole, e.g., by `SystemExit`
+            return self._verify_fallback(import_list, timeout)
+        unsupported = [s for s in import_list if statuses.get(s) == 'unsupported']
+        invalid_set = set(self._verify_fallback(unsupported, timeout)) if unsupported else set()
+        return [s for s in import_list if statuses.get(s) == 'invalid' or s in invalid_set]
+
+    def _run(self, interp, import_list: list[str], fd: int, reply: dict) -> None:
+        try:
+            # Returns the uncaught exception on 3.13+, raises `RunFailedError` on 3.12
+            reply['error'] = _xi.run_string(
+                interp, _SUBINTERPRETER_PROGRAM, shared={'statements': json.dumps(import_list), 'fd': fd}
+            )
+        except Exception as e:
+            reply['error'] = e
+
+    def _verify_fallback(self, import_list: list[str], timeout) -> list[str]:
+        self.fallbacks += len(import_list)
+        if self._fallback is None:
+            self._fallback = get_verifier_worker()
+        return self._fallback.verify(import_list, timeout=timeout)
+
+    def _acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return _create()
+
+    def _fill(self) -> None:
+        """Creates subinterpreters in a background thread until `size` are ready."""
+        with self._lock:
+            if self._filler is not None or self._closed or len(self._idle) >= self.size:
+                return
+            self._filler = threading.Thread(target=self._fill_idle, daemon=True)
+            self._filler.start()
+
+    def _fill_idle(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) >= self.size:
+                    self._filler = None
+                    return
+            interp = _create()
+            with self._lock:
+                self._idle.append(interp)
+
+
+def _create():
+    """Creates a subinterpreter sharing the GIL of this one, in which single-phase extension modules can be loaded."""
+    # Isolated subinterpreters of 3.12 may crash the process after failing to load such a module, e.g., `_datetime`
+    if sys.version_info < (3, 13):
+        return _xi.create(isolated=False)
+    return _xi.create('legacy')
+
+
+_shared_pool = None
+
+
+def get_subinterpreter_pool() -> SubinterpreterPool:
+    """Returns the process-wide pool, created on first use."""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = SubinterpreterPool()
+    return _shared_pool
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+# src/importlens/tracer.py
+"""A tracer that records the names bound by import statements as they are executed."""
+import sys
+import dis
+import time
+import builtins
+from types import CodeType, FrameType, ModuleType
+
+from .importlens import _compile_ignore, _get_module_resolver, _get_reexport_index, _iter_records, format_imports
+
+# Instructions between `IMPORT_NAME` and the stores of the bound names
+_STACK_OPS = {'IMPORT_FROM', 'POP_TOP', 'ROT_TWO', 'SWAP', 'COPY', 'NOP', 'EXTENDED_ARG', 'CACHE'}
+_STORE_OPS = {'STORE_NAME', 'STORE_GLOBAL', 'STORE_FAST', 'STORE_DEREF'}
+_INTRINSIC_IMPORT_STAR = 2  # the argument of `CALL_INTRINSIC_1` for `from ... import *`
+
+_MISSING = object()
+
+
+class ImportTracer:
+    """Records the names bound by each import statement executed while tracing, to reconstruct the statements
+    of a module or frame from those names only, instead of scanning all its bindings.
+
+    `builtins.__import__` is wrapped while tracing. The names bound by a statement are read from the bytecode
+    following its `IMPORT_NAME` instruction, which is decoded once per statement. Objects are resolved
+    only when queried, by the same rules as `inspect_imports`.
+
+    Args:
+        max_codes (int): The maximum number of code objects to keep the decoded statements of. The cache is cleared when exceeded.
+            Defaults to 10000.
+
+    Attributes:
+        calls (int): The number of traced import statements.
+        seconds (float): The time spent by the tracer itself, excluding the imports.
+
+    Examples:
+        >>> from importlens import ImportTracer
+        >>> with ImportTracer() as tracer:
+        ...     import numpy as np
+        ...     from math import floor
+        >>> tracer.inspect()
+        ['import numpy as np', 'from math import floor']
+
+    **Limitations:**
+    1. Only import statements executed while tracing are recorded. Names bound in other ways,
+        e.g., `f = math.floor`, and calls of `importlib.import_module` or `__import__` are not.
+    2. Names bound by `from ... import *` are those public at the time of the import.
+    """
+
+    def __init__(self, max_codes: int = 10000):
+        self.max_codes = max_codes
+        self.calls = 0
+        self.seconds = 0.0
+        self._sites = {}  # code -> {offset of `IMPORT_NAME`: (store instructions, is wildcard), or None}
+        self._scopes = {}  # id(namespace dict or code) -> (namespace dict or code, {name: None})
+        self._original = None
+        self._active = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self) -> None:
+        """Starts recording the import statements."""
+        if self._active:
+            return
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+        self._active = True
+
+    def stop(self) -> None:
+        """Stops recording. The recorded names are kept until `clear`."""
+        if not self._active:
+            return
+        self._active = False
+        if builtins.__import__ == self._import:
+            builtins.__import__ = self._original
+        # Otherwise another wrapper was installed later, and this one only passes through from now on
+
+    def clear(self) -> None:
+        """Forgets the recorded names and the decoded bytecode."""
+        self._sites.clear()
+        self._scopes.clear()
+        self.calls = 0
+        self.seconds = 0.0
+
+    def iter_imports(self, target: ModuleType | FrameType | None = None, ignore: list[str] = []):
+        """Yields an `ImportRecord` of each recorded name in a module or frame. See `iter_imports`.
+
+        Args:
+            target (module or frame): Defaults to None, in which case the caller's frame is inspected.
+            ignore (list): See `inspect_imports`. Defaults to [].
+        """
+        if target is None:
+            target = sys._getframe(1)
+        return _iter_records(
+            self._bindings(target).items(), _compile_ignore(ignore), _get_module_resolver(), {},
+            _get_reexport_index()
+        )
+
+    def inspect(self, target: ModuleType | FrameType | None = None, max_obj: int = 3,
+                ignore: list[str] = []) -> list[str]:
+        """Reconstructs the statements of the recorded names in a module or frame. See `inspect_imports`.
+
+        Args:
+            target (module or frame): Defaults to None, in which case the caller's frame is inspected.
+            max_obj (int): See `inspect_imports`. Defaults to 3.
+            ignore (list): See `inspect_imports`. Defaults to [].
+
+        Returns:
+            list: Import statement strings.
+        """
+        if target is None:
+            target = sys._getframe(1)
+        return format_imports(self.iter_imports(target, ignore), max_obj)
+
+    def _bindings(self, target) -> dict:
+        """Returns the recorded names bound in the module or frame with their current objects."""
+        if isinstance(target, ModuleType):
+            scopes = [(vars(target), vars(target))]
+        else:
+            f_locals = target.f_locals
+            scopes = [(target.f_globals, target.f_globals), (f_locals, f_locals), (target.f_code, f_locals)]
+        bindings = {}
+        for key, namespace in scopes:
+            entry = self._scopes.get(id(key))
+            if entry is None or entry[0] is not key:
+                continue
+            for name in entry[1]:
+                obj = namespace.get(name, _MISSING)
+                if obj is not _MISSING:
+                    bindings[name] = obj
+        return bindings
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module = self._original(name, globals, locals, fromlist, level)
+        if not self._active:
+            return module
+
+        start = time.perf_counter()
+        frame = sys._getframe(1)
+        code, offset = frame.f_code, frame.f_lasti
+        sites = self._sites.get(code)
+        if sites is None:
+            if len(self._sites) >= self.max_codes:
+                self._sites.clear()
+            sites = self._sites[code] = {}
+        site = sites.get(offset, _MISSING)
+        if site is _MISSING:
+            site = sites[offset] = (
+                _decode_site(code, offset) if dis.opname[code.co_code[offset]] == 'IMPORT_NAME' else None
+            )
+        if site is not None:  # called by an import statement rather than `__import__()`
+            stores, is_wildcard = site
+            if is_wildcard:
+                names = getattr(module, '__all__', None)
+                if names is None:
+                    names = [k for k in vars(module) if not k.startswith('_')]
+                self._record(frame.f_locals, names)
+            for opname, store_name in stores:
+                if opname == 'STORE_NAME':
+                    self._record(frame.f_locals, [store_name])
+                elif opname == 'STORE_GLOBAL':
+                    self._record(frame.f_globals, [store_name])
+                else:  # local variables of a function
+                    self._record(frame.f_code, [store_name])
+            self.calls += 1
+        self.seconds += time.perf_counter() - start
+        return module
+
+    def _record(self, key: dict | CodeType, names) -> None:
+        entry = self._scopes.get(id(key))
+        if entry is None or entry[0] is not key:
+            entry = self._scopes[id(key)] = (key, {})
+        entry[1].update(dict.fromkeys(names))
+
+
+def _decode_site(code: CodeType, offset: int) -> tuple[list[tuple[str, str]], bool]:
+    """Returns `(stores, is_wildcard)` of the import statement whose `IMPORT_NAME` is at `offset`."""
+    co_code = code.co_code
+    stores = []
+    extended = 0
+    for i in range(offset + 2, len(co_code), 2):
+        opname = dis.opname[co_code[i]]
+        arg = co_code[i + 1] | extended
+        if opname == 'EXTENDED_ARG':
+            extended = arg << 8
+            continue
+        extended = 0
+        if opname in _STORE_OPS:
+            stores.append((opname, _store_name(code, opname, arg)))
+        elif opname == 'IMPORT_STAR' or (opname == 'CALL_INTRINSIC_1' and arg == _INTRINSIC_IMPORT_STAR):
+            return stores, True
+        elif opname not in _STACK_OPS:
+            break
+    return stores, False
+
+
+def _store_name(code: CodeType, opname: str, arg: int) -> str:
+    if opname in ('STORE_NAME', 'STORE_GLOBAL'):
+        return code.co_names[arg]
+    if hasattr(code, '_varname_from_oparg'):  # 3.11+, indexes all fast locals
+        return code._varname_from_oparg(arg)
+    if opname == 'STORE_FAST':
+        return code.co_varnames[arg]
+    return (code.co_cellvars + code.co_freevars)[arg]
@@ -1,46 +1,496 @@
 # -*- coding: utf-8 -*-
 # src/importlens/verify.py
 """Functions to verify the reconstructed statements."""
+import os
+import ast
 import sys
+import json
+import heapq
+import queue
+import threading
 import subprocess
 import warnings
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 
+from .static import check_import
+from .worker import get_verifier_worker
 
-def verify_imports(import_list: list[str], timeout=5, verbose=False) -> list[str]:
-    """Verifies the import statements and returns a list of invalid ones."""
+
+class ImportProfile(NamedTuple):
+    """The cost of one import statement, measured in order with the others in one new Python process.
+
+    Modules already imported by an earlier statement are not imported again, so the cost of a dependency
+    shared by many statements is charged to the first statement that imports it.
+    """
+    statement: str
+    valid: bool
+    seconds: float  # wall time
+    new_modules: int  # number of entries added to `sys.modules`
+    peak_memory: int  # in bytes, peak memory allocated while importing, traced by `tracemalloc`
+
+
+def verify_imports(import_list: list[str], timeout=5, verbose=False, worker=None, cache=None,
+                   profile=False, static=False, stats=None) -> list[str] | tuple[list[str], list[ImportProfile]]:
+    """Verifies the import statements and returns a list of invalid ones.
+
+    Args:
+        import_list (list): Import statement strings.
+        timeout (float): Seconds to wait for the verification. Defaults to 5.
+        verbose (bool): Print the progress and the invalid statements. Defaults to False.
+        worker (VerifierWorker): A long-lived worker to use instead of starting a new Python process. Defaults to None.
+        cache (VerificationCache): A persistent cache of the results. Only the statements not in the cache are
+            verified. Defaults to None.
+        profile (bool): Also measure the cost of each statement. Defaults to False.
+            All statements then run in order in one new Python process, without the `worker` or the `cache`,
+            which is neither read nor updated. See `ImportProfile`.
+            Tracing the memory slows down the imports, so the times are best compared with each other.
+        static (bool): First check the statements without executing any module code by `check_import`,
+            which finds the module specs and reads the module sources. Only the statements it finds valid are
+            not executed, since a module may bind names its source does not show. Defaults to False.
+            Ignored if `profile` is True.
+        stats (PhaseStats): Accumulates the time of each phase and the counts of statements. Defaults to None.
+
+    Returns:
+        list: Invalid import statement strings. Statements that could not be verified in time, or were not reached
+            because the process exited, are also returned.
+        If `profile` is True, returns a tuple of the list and an `ImportProfile` for each statement verified in time.
+    """
     if not import_list:
-        return []
+        return ([], []) if profile else []
 
-    test_program = f"""# Imports a module
-for import_str in {import_list}:
+    phase = stats.phase if stats is not None else _skip_phase
+    executable = getattr(worker, 'executable', sys.executable) if worker is not None else sys.executable
+    with phase('cache'):
+        cached = cache.get_many(import_list, executable) if cache is not None and not profile else {}
+    known = dict(cached)  # results not to be verified by executing
+    if static and not profile:
+        with phase('static'):
+            for s in import_list:
+                if s.strip() not in known and check_import(s):  # only True is trusted, see `check_import`
+                    known[s.strip()] = True
+        verbose and print(f"{len(known) - len(cached)} statements checked statically.")
+    pending_list = [s for s in import_list if s.strip() not in known]
+    if stats is not None:
+        stats.count('statements', len(import_list))
+        stats.count('statements_cached', len(cached))
+        stats.count('statements_static', len(known) - len(cached))
+        stats.count('statements_executed', len(pending_list))
+
+    # Writes `(statement, is valid)` of each statement, so that those not reached after a crash are known
+    test_program = f"""# Imports each statement
+import os
+
+out = os.fdopen(os.dup(1), 'w')
+os.dup2(os.open(os.devnull, os.O_RDWR), 1)  # silence prints from the imported modules
+for import_str in {pending_list}:
+    try:
+        exec(import_str.strip(), {{}})
+        valid = True
+    except (ModuleNotFoundError, ImportError):
+        valid = False
+    except Exception:  # not an invalid import
+        valid = True
+    out.write(repr((import_str.strip(), valid)) + '\\n')
+    out.flush()
+"""
+
+    # Only builtin modules are used, so that the new modules of each statement are all counted
+    profile_program = f"""# Profiles the imports
+import os
+import sys
+import time
+import _tracemalloc
+
+out = os.fdopen(os.dup(1), 'w')
+os.dup2(os.open(os.devnull, os.O_RDWR), 1)  # silence prints from the imported modules
+_tracemalloc.start()
+for import_str in {pending_list}:
+    _tracemalloc.reset_peak()
+    memory, _ = _tracemalloc.get_traced_memory()
+    n_modules = len(sys.modules)
+    start = time.perf_counter()
     try:
         exec(import_str.strip())
+        valid = True
     except (ModuleNotFoundError, ImportError):
-        print(import_str.strip())
+        valid = False
+    seconds = time.perf_counter() - start
+    _, peak = _tracemalloc.get_traced_memory()
+    out.write(repr((import_str.strip(), valid, seconds, len(sys.modules) - n_modules, peak - memory)) + '\\n')
+    out.flush()
 """
 
     invalid_list = []
+    profile_list = []
+    verified = {}  # {stripped statement: is valid} of the statements executed to the end
     try:
-        # Run in a new Python process
         verbose and print("Verifying the import statements...")
-        result = subprocess.run(
-            [sys.executable, "-c", test_program],
-            capture_output=True,
-            text=True,
-            timeout=timeout  # in seconds
-        )
-        invalid_str = result.stdout.strip()
-        if not invalid_str:
-            verbose and print("--- All imports are verified ---")
+        if not pending_list:
+            pass
+        elif profile:
+            try:
+                output = _run_program(profile_program, timeout, phase)
+            except subprocess.TimeoutExpired as e:
+                profile_list = _parse_profiles(e.stdout)  # keep the statements profiled in time
+                raise
+            with phase('parse'):
+                profile_list = _parse_profiles(output)
+                invalid_list = [p.statement for p in profile_list if not p.valid]
+        elif worker is not None:
+            with phase('execute'):
+                invalid_list = worker.verify(pending_list, timeout=timeout)
+            invalid_set = {s.strip() for s in invalid_list}
+            verified = {s.strip(): s.strip() not in invalid_set for s in pending_list}  # raises after a crash
         else:
-            invalid_list = [line for line in invalid_str.split('\n')]
-            if verbose:
-                print("--- These import statements are invalid ---")
-                for s in invalid_list:
-                    print(f"# {s}")
-                verbose and print('-' * 43)
-        return invalid_list
+            # Run in a new Python process
+            output = _run_program(test_program, timeout, phase)
+            with phase('parse'):
+                verified = _parse_statuses(output)
+                unverified = [s for s in pending_list if s.strip() not in verified]
+                if unverified:
+                    warnings.warn(UserWarning(
+                        f"The process exited before verifying {len(unverified)} statements. They are not cached."
+                    ))
+                invalid_list = [s.strip() for s in pending_list if verified.get(s.strip()) is not True]
+
+        with phase('parse'):
+            invalid_set = set(invalid_list)
+            if cache is not None and not profile:  # only the statements whose status was reported
+                cache.put_many(verified, executable)
+            if known:  # merge in the input order
+                invalid_list = [
+                    s.strip() for s in import_list
+                    if s.strip() in invalid_set or known.get(s.strip()) is False
+                ]
+        stats is not None and stats.count('statements_invalid', len(invalid_list))
+
+        if not invalid_list:
+            verbose and print("--- All imports are verified ---")
+        elif verbose:
+            print("--- These import statements are invalid ---")
+            for s in invalid_list:
+                print(f"# {s}")
+            verbose and print('-' * 43)
+        verbose and profile and _print_profiles(profile_list)
+        return (invalid_list, profile_list) if profile else invalid_list
 
     except subprocess.TimeoutExpired:
         warnings.warn(UserWarning(f"Timed out after {timeout} seconds. Verification failed."))
-        return import_list
+        invalid_list = [s for s in import_list if known.get(s.strip()) is not True]
+        return (invalid_list, profile_list) if profile else invalid_list
+
+    except OSError as e:  # the worker kept exiting, or the process could not be started
+        warnings.warn(UserWarning(f"{e} Verification failed."))
+        invalid_list = [s for s in import_list if known.get(s.strip()) is not True]
+        return (invalid_list, profile_list) if profile else invalid_list
+
+
+def _run_program(program: str, timeout, phase) -> str:
+    """Runs a program in a new Python process like `subprocess.run`, and returns its output."""
+    with phase('spawn'):
+        process = subprocess.Popen(
+            [sys.executable, "-c", program], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+    with process:
+        try:
+            with phase('execute'):
+                output, _ = process.communicate(timeout=timeout)  # in seconds
+        except subprocess.TimeoutExpired as e:
+            process.kill()
+            e.stdout, _ = process.communicate()
+            raise
+    return output
+
+
+def _skip_phase(phase: str) -> contextlib.nullcontext:
+    """Stands for `PhaseStats.phase` when nothing is measured."""
+    return _NO_PHASE
+
+
+_NO_PHASE = contextlib.nullcontext()
+
+
+def _parse_profiles(output: str | bytes | None) -> list[ImportProfile]:
+    if isinstance(output, bytes):
+        output = output.decode(errors='replace')
+    profile_list = []
+    for line in (output or '').splitlines():
+        try:
+            profile_list.append(ImportProfile(*ast.literal_eval(line)))
+        except (ValueError, TypeError, SyntaxError):  # an incomplete line
+            continue
+    return profile_list
+
+
+def _parse_statuses(output: str) -> dict[str, bool]:
+    """Parses the `(statement, is valid)` lines of the test program."""
+    statuses = {}
+    for line in output.splitlines():
+        try:
+            statement, valid = ast.literal_eval(line)
+        except (ValueError, TypeError, SyntaxError):  # an incomplete line
+            continue
+        statuses[statement] = valid
+    return statuses
+
+
+def _print_profiles(profile_list: list[ImportProfile]) -> None:
+    print("--- Import costs (slowest first) ---")
+    for p in sorted(profile_list, key=lambda p: p.seconds, reverse=True):
+        print(f"# {p.seconds * 1000:9.1f} ms {p.new_modules:5d} modules {p.peak_memory / 2**20:8.2f} MiB  {p.statement}")
+    print('-' * 43)
+
+
+class VerificationResult(NamedTuple):
+    """Statements grouped by their verification status, each in the input order."""
+    valid: list[str]
+    invalid: list[str]
+    timed_out: list[str]
+
+
+class VerificationMatrix(NamedTuple):
+    """The status of each statement on each interpreter: 'valid', 'invalid' or 'timed_out'."""
+    statements: list[str]
+    interpreters: list[str]
+    statuses: list[list[str]]  # one row per statement, one column per interpreter
+
+    def column(self, interpreter: str) -> dict[str, str]:
+        """Returns `{statement: status}` on one interpreter."""
+        j = self.interpreters.index(interpreter)
+        return {s: row[j] for s, row in zip(self.statements, self.statuses)}
+
+    def incompatible(self) -> list[str]:
+        """Returns the statements that are not valid on every interpreter."""
+        return [s for s, row in zip(self.statements, self.statuses) if any(status != 'valid' for status in row)]
+
+
+# Imports each statement from stdin and prints its status on a private copy of stdout
+_SHARD_PROGRAM = r"""# Imports each statement
+import os
+import sys
+import json
+
+out = os.fdopen(os.dup(1), 'w')
+os.dup2(os.open(os.devnull, os.O_RDWR), 1)  # silence prints from the imported modules
+import_list = json.loads(sys.stdin.read())
+out.write('ready\n')
+out.flush()
+namespace = {}
+for import_str in import_list:
+    try:
+        exec(import_str.strip(), namespace)
+        status = 'valid'
+    except Exception:
+        status = 'invalid'
+    out.write(status + '\n')
+    out.flush()
+"""
+
+_STARTUP_TIMEOUT = 30  # in seconds, not counted in the time budget of the statements
+
+
+def verify_imports_parallel(import_list: list[str], jobs: int | None = None, timeout=5,
+                            verbose=False) -> VerificationResult:
+    """Verifies the import statements across a pool of Python processes with a time budget for each statement.
+
+    Statements are grouped by their top-level package, so that the shared imports of a package are loaded once
+    by the same process. A statement that does not finish within `timeout` seconds is marked as timed out,
+    and the remaining statements of its group continue in a new process.
+    Unlike `verify_imports`, a statement that raises any exception, or crashes its process, is invalid.
+
+    Args:
+        import_list (list): Import statement strings.
+        jobs (int): The number of processes to run at the same time. Defaults to `os.cpu_count()`.
+        timeout (float): Seconds to wait for each statement. Defaults to 5.
+        verbose (bool): Print the progress and the statements that are not valid. Defaults to False.
+
+    Returns:
+        VerificationResult: The valid, invalid and timed-out statements.
+
+    Raises:
+        OSError: If a process cannot be started, or exits before reading the statements, twice in a row.
+    """
+    if not import_list:
+        return VerificationResult([], [], [])
+
+    status_list = [None] * len(import_list)
+    shards = _shard_by_package(import_list, jobs or os.cpu_count() or 1)
+
+    verbose and print(f"Verifying the import statements in {len(shards)} processes...")
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        for future in [executor.submit(_run_shard, import_list, shard, timeout, status_list) for shard in shards]:
+            future.result()
+
+    result = VerificationResult(*(
+        [s for s, status in zip(import_list, status_list) if status == key]
+        for key in ('valid', 'invalid', 'timed_out')
+    ))
+    if verbose:
+        if not result.invalid and not result.timed_out:
+            print("--- All imports are verified ---")
+        if result.invalid:
+            print("--- These import statements are invalid ---")
+            for s in result.invalid:
+                print(f"# {s}")
+        if result.timed_out:
+            print(f"--- These import statements timed out after {timeout} seconds ---")
+            for s in result.timed_out:
+                print(f"# {s}")
+        if result.invalid or result.timed_out:
+            print('-' * 43)
+    return result
+
+
+def verify_imports_matrix(import_list: list[str], interpreters: list[str], timeout=5,
+                          verbose=False) -> VerificationMatrix:
+    """Verifies the import statements on several Python interpreters at the same time.
+
+    Each interpreter verifies all statements in its process-wide `VerifierWorker`, which is started on first use
+    and kept warm for the next calls, so a check takes about as long as the slowest interpreter.
+
+    Args:
+        import_list (list): Import statement strings.
+        interpreters (list): Paths of Python executables, e.g., of other versions or virtual environments.
+        timeout (float): Seconds to wait for each interpreter, including its startup on first use. Defaults to 5.
+        verbose (bool): Print the progress and the statements that are not valid everywhere. Defaults to False.
+
+    Returns:
+        VerificationMatrix: The status of each statement, stripped and without duplicates, on each interpreter.
+        All statements are 'timed_out' on an interpreter that does not reply in time,
+        and 'invalid' on one that cannot be started.
+
+    Examples:
+        >>> from importlens import verify_imports_matrix
+        >>> matrix = verify_imports_matrix(["import tomllib"], ['python3.10', 'python3.11'])
+        >>> matrix.statuses
+        [['invalid', 'valid']]
+    """
+    statements = list(dict.fromkeys(s.strip() for s in import_list))
+    interpreters = list(dict.fromkeys(interpreters))
+    if not statements or not interpreters:
+        return VerificationMatrix(statements, interpreters, [[] for _ in statements] if not interpreters else [])
+
+    verbose and print(f"Verifying the import statements on {len(interpreters)} interpreters...")
+    with ThreadPoolExecutor(max_workers=len(interpreters)) as executor:
+        columns = list(executor.map(lambda executable: _verify_column(statements, executable, timeout), interpreters))
+    matrix = VerificationMatrix(statements, interpreters, [list(row) for row in zip(*columns)])
+
+    if verbose:
+        incompatible = matrix.incompatible()
+        if not incompatible:
+            print("--- All imports are verified ---")
+        else:
+            print("--- These import statements are not valid on every interpreter ---")
+            for s in incompatible:
+                print(f"# {s}")
+                for executable, status in zip(interpreters, matrix.statuses[statements.index(s)]):
+                    status != 'valid' and print(f"#   {status}: {executable}")
+            print('-' * 43)
+    return matrix
+
+
+def _verify_column(statements: list[str], executable: str, timeout) -> list[str]:
+    """Returns the status of each statement on one interpreter."""
+    try:
+        invalid_set = set(get_verifier_worker(executable).verify(statements, timeout=timeout))
+    except subprocess.TimeoutExpired:
+        warnings.warn(UserWarning(f"Timed out after {timeout} seconds on {executable}. Verification failed."))
+        return ['timed_out'] * len(statements)
+    except OSError as e:  # not found, or the worker kept exiting
+        warnings.warn(UserWarning(f"{e} Verification failed on {executable}."))
+        return ['invalid'] * len(statements)
+    return ['invalid' if s in invalid_set else 'valid' for s in statements]
+
+
+def _top_level_package(import_str: str) -> str:
+    """Returns the top-level package of 'import a.b as c' or 'from a.b import c', or '' if not found."""
+    words = import_str.split()
+    if len(words) < 2 or words[0] not in ('import', 'from'):
+        return ''
+    return words[1].rstrip(',;').lstrip('.').split('.')[0]
+
+
+def _shard_by_package(import_list: list[str], jobs: int) -> list[list[int]]:
+    """Splits the indices of the statements into at most `jobs` shards, keeping each package in one shard."""
+    groups = {}
+    for i, import_str in enumerate(import_list):
+        groups.setdefault(_top_level_package(import_str), []).append(i)
+
+    # Put the largest groups first, each into the currently smallest shard
+    shards = [[] for _ in range(min(jobs, len(groups)))]
+    heap = [(0, k) for k in range(len(shards))]
+    for indices in sorted(groups.values(), key=len, reverse=True):
+        size, k = heapq.heappop(heap)
+        shards[k].extend(indices)
+        heapq.heappush(heap, (size + len(indices), k))
+    for shard in shards:
+        shard.sort()
+    return shards
+
+
+def _run_shard(import_list: list[str], shard: list[int], timeout, status_list: list) -> None:
+    """Verifies the statements in one shard, starting a new process after a timeout or a crash.
+
+    Raises:
+        OSError: If the process cannot be started, or exits before reading the statements, twice in a row.
+    """
+    pending = list(shard)
+    failed = False  # the last process failed to start
+    while pending:
+        process = None
+        lines = queue.Queue()
+        try:
+            process = subprocess.Popen(
+                [sys.executable, "-c", _SHARD_PROGRAM],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+            threading.Thread(target=_read_lines, args=(process.stdout, lines), daemon=True).start()
+            process.stdin.write(json.dumps([import_list[i] for i in pending]))
+            process.stdin.close()
+            if lines.get(timeout=_STARTUP_TIMEOUT) != 'ready':
+                raise BrokenPipeError("The verifier process exited unexpectedly.")
+        except queue.Empty:  # not started in time, e.g., on a busy machine
+            for i in pending:
+                status_list[i] = 'timed_out'
+            _kill(process)
+            return
+        except OSError:  # not the fault of the statements, retry once
+            process is not None and _kill(process)
+            if failed:
+                raise
+            failed = True
+            continue
+        failed = False
+
+        while pending:
+            try:
+                status = lines.get(timeout=timeout)
+            except queue.Empty:
+                status_list[pending.pop(0)] = 'timed_out'
+                break
+            if status is None:  # crashed while importing
+                status_list[pending.pop(0)] = 'invalid'
+                break
+            status_list[pending.pop(0)] = status
+        _kill(process)
+
+
+def _read_lines(stream, lines: queue.Queue) -> None:
+    try:
+        for line in stream:
+            lines.put(line.strip())
+    except (OSError, ValueError):
+        pass
+    lines.put(None)
+
+
+def _kill(process: subprocess.Popen) -> None:
+    if process.poll() is None:
+        process.kill()
+    process.wait()
+    process.stdout.close()
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# src/importlens/worker.py
+"""A long-lived worker process to verify the reconstructed statements."""
+import os
+import sys
+import json
+import queue
+import signal
+import threading
+import subprocess
+
+# Reads one JSON request per line and writes one JSON reply per line to a private copy of stdout.
+# Each batch runs in a forked child so that the imports never leak into the worker or the next batch.
+# Without `os.fork`, the batch runs in the worker itself, which exits afterwards and gets replaced.
+_WORKER_PROGRAM = r"""# Verifies batches of import statements
+import os
+import sys
+import json
+
+out = os.fdopen(os.dup(1), 'w')
+os.dup2(os.open(os.devnull, os.O_RDWR), 1)  # silence prints from the imported modules
+
+for name in json.loads(sys.argv[1]):
+    try:
+        __import__(name)
+    except Exception:
+        pass
+
+def check(import_list, write):
+    for import_str in import_list:
+        try:
+            exec(import_str.strip(), {})
+        except (ModuleNotFoundError, ImportError):
+            write(import_str.strip())
+        except Exception:  # not an invalid import
+            pass
+
+def reply(message):
+    out.write(json.dumps(message) + '\n')
+    out.flush()
+
+for line in sys.stdin:
+    request = json.loads(line)
+    if request['op'] == 'ping':
+        reply({'op': 'pong'})
+        continue
+
+    if not hasattr(os, 'fork'):
+        invalid_list = []
+        check(request['import_list'], invalid_list.append)
+        reply({'op': 'result', 'invalid': invalid_list, 'recycle': True})
+        break
+
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        status = 1
+        try:
+            os.close(r)
+            with os.fdopen(w, 'w') as f:
+                def write(s):
+                    f.write(s + '\n')
+                    f.flush()
+                check(request['import_list'], write)
+                write('\0')  # all statements were verified
+            status = 0
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+        finally:
+            os._exit(status)
+    os.close(w)
+    with os.fdopen(r) as f:
+        invalid_list = f.read().splitlines()
+    os.waitpid(pid, 0)
+    crashed = invalid_list[-1:] != ['\0']  # exited early, e.g., by `os._exit` in a statement
+    reply({'op': 'result', 'invalid': [s for s in invalid_list if s != '\0'], 'crashed': crashed})
+"""
+
+
+class VerifierWorker:
+    """A pre-started Python process that verifies import statements over a pipe.
+
+    It avoids the interpreter startup of `verify_imports` on every call. Modules in `preload` are imported
+    once by the worker and inherited by the clean child that is forked for each batch.
+    A worker that dies or does not reply in time is killed and restarted automatically.
+
+    Args:
+        preload (list): Modules to import in the worker in advance. Defaults to [].
+        executable (str): The Python interpreter to run. Defaults to `sys.executable`.
+
+    Examples:
+        >>> from importlens import VerifierWorker, verify_imports
+        >>> with VerifierWorker() as worker:
+        ...     invalid_list = verify_imports(["import os", "import dummy"], worker=worker)
+    """
+
+    def __init__(self, preload: list[str] = [], executable: str | None = None):
+        self.preload = list(preload)
+        self.executable = executable or sys.executable
+        self._process = None
+        self._replies = None
+        self._lock = threading.Lock()
+        self.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self) -> None:
+        """Starts the worker process if it is not running."""
+        if self.is_alive():
+            return
+        self._process = subprocess.Popen(
+            [self.executable, "-c", _WORKER_PROGRAM, json.dumps(self.preload)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            start_new_session=(os.name == 'posix'),  # so that the forked children can be killed together
+        )
+        self._replies = queue.Queue()
+        threading.Thread(target=self._read_replies, args=(self._process, self._replies), daemon=True).start()
+
+    def close(self) -> None:
+        """Stops the worker process and its children."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            try:
+                if os.name == 'posix':
+                    os.killpg(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
+            except (ProcessLookupError, PermissionError):
+                pass
+        process.wait()
+        for pipe in (process.stdin, process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+    def restart(self) -> None:
+        """Kills and restarts the worker process."""
+        self.close()
+        self.start()
+
+    def is_alive(self) -> bool:
+        """Returns True if the worker process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def ping(self, timeout: float = 1, restart: bool = True) -> bool:
+        """Checks that the worker replies within `timeout` seconds, restarting it if not and `restart` is True."""
+        with self._lock:
+            try:
+                self._request({'op': 'ping'}, timeout)
+                return True
+            except (subprocess.TimeoutExpired, OSError):
+                restart and self.restart()
+                return False
+
+    def verify(self, import_list: list[str], timeout=5) -> list[str]:
+        """Verifies the import statements and returns a list of invalid ones.
+
+        Raises:
+            subprocess.TimeoutExpired: If the worker does not reply within `timeout` seconds.
+            OSError: If the worker exits twice in a row while verifying, or a statement ends the process
+            verifying it, e.g., by `os._exit`, so that the statements after it are not verified.
+            The worker is restarted before raising.
+        """
+        if not import_list:
+            return []
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    reply = self._request({'op': 'verify', 'import_list': list(import_list)}, timeout)
+                    break
+                except subprocess.TimeoutExpired:
+                    self.restart()
+                    raise
+                except OSError:  # the worker died before or while verifying, retry once
+                    self.restart()
+                    if attempt:
+                        raise
+            if reply.get('recycle'):
+                self.restart()
+            if reply.get('crashed'):
+                raise ChildProcessError("A statement ended the verifier process.")
+            return reply['invalid']
+
+    def _request(self, message: dict, timeout) -> dict:
+        self.start()
+        self._process.stdin.write(json.dumps(message) + '\n')
+        self._process.stdin.flush()
+        try:
+            reply = self._replies.get(timeout=timeout)
+        except queue.Empty:
+            raise subprocess.TimeoutExpired(self.executable, timeout)
+        if reply is None:  # the worker exited
+            raise BrokenPipeError("The verifier worker exited unexpectedly.")
+        return reply
+
+    @staticmethod
+    def _read_replies(process, replies):
+        try:
+            for line in process.stdout:
+                try:
+                    replies.put(json.loads(line))
+                except ValueError:
+                    continue
+        except (OSError, ValueError):  # closed by `close`
+            pass
+        replies.put(None)
+
+
+_shared_workers = {}  # executable -> worker
+_shared_lock = threading.Lock()
+
+
+def get_verifier_worker(executable: str | None = None) -> VerifierWorker:
+    """Returns the process-wide worker of an interpreter, started on first use and kept warm afterwards."""
+    executable = executable or sys.executable
+    with _shared_lock:
+        worker = _shared_workers.get(executable)
+        if worker is None:
+            worker = _shared_workers[executable] = VerifierWorker(executable=executable)
+    return worker
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# tests/test_averify.py
+import os
+import time
+import asyncio
+import pytest
+from src.importlens import AsyncVerifier, averify_imports
+
+
+def test_averify_imports():
+    """Tests the invalid statements, in the input order."""
+    import_list = ["import os", " import importlens_dummy", "from math import importlens_dummy", "from json import dumps"]
+    invalid_list = asyncio.run(averify_imports(import_list, verifier=AsyncVerifier()))
+    assert invalid_list == ["import importlens_dummy", "from math import importlens_dummy"]
+    assert asyncio.run(averify_imports([])) == []
+
+
+def test_batching():
+    """Tests that overlapping concurrent requests are verified by one child process."""
+    verifier = AsyncVerifier(max_concurrency=1)
+
+    async def main():
+        return await asyncio.gather(
+            averify_imports(["import os", "import importlens_dummy"], verifier=verifier),
+            averify_imports(["import importlens_dummy", "import json"], verifier=verifier),
+            averify_imports(["import os"], verifier=verifier),
+        )
+    assert asyncio.run(main()) == [["import importlens_dummy"], ["import importlens_dummy"], []]
+    assert verifier.runs == 1
+
+
+def test_cancel(tmp_path):
+    """Tests that cancelling the only request kills its child process."""
+    path = os.path.join(tmp_path, 'pid')
+    statement = f"import os, time; open({path!r}, 'w').write(str(os.getpid())); time.sleep(30)"
+    verifier = AsyncVerifier()
+
+    async def main():
+        task = asyncio.create_task(averify_imports([statement], timeout=60, verifier=verifier))
+        while not os.path.exists(path) or not os.path.getsize(path):
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert not verifier._futures
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    assert time.perf_counter() - start < 20
+    with pytest.raises(ProcessLookupError):
+        with open(path) as f:
+            os.kill(int(f.read()), 0)
+
+
+def test_timeout():
+    """Tests that the statements not verified in time are returned with a warning."""
+    import_list = ["import os", "import time; time.sleep(30)", "import json"]
+    with pytest.warns(UserWarning, match="Timed out"):
+        invalid_list = asyncio.run(averify_imports(import_list, timeout=1, verifier=AsyncVerifier()))
+    assert invalid_list == import_list[1:]
+
+
+def test_start_error(monkeypatch):
+    """Tests that the statements are returned when the child process cannot be started."""
+    async def fail(*args, **kwargs):
+        raise OSError("Cannot start.")
+
+    monkeypatch.setattr(asyncio, 'create_subprocess_exec', fail)
+    import_list = ["import os", "import json"]
+    invalid_list = asyncio.run(asyncio.wait_for(averify_imports(import_list, verifier=AsyncVerifier()), 10))
+    assert invalid_list == import_list
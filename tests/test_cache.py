@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# tests/test_cache.py
+import os
+import pytest
+from src.importlens import verify_imports, VerificationCache
+import src.importlens.cache as cache_module
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with VerificationCache(path=os.path.join(tmp_path, 'verify.sqlite3'), max_entries=3) as cache:
+        yield cache
+
+
+def test_verification(cache, monkeypatch):
+    """Tests that the cached results are used and only the misses are verified."""
+    import_list = ["import os", "import dummy", "from os import dummy"]
+    assert verify_imports(import_list, cache=cache) == ["import dummy", "from os import dummy"]
+    assert cache.get_many(import_list) == {"import os": True, "import dummy": False, "from os import dummy": False}
+
+    def run(*args, **kwargs):
+        raise AssertionError("Should not be called")
+
+    monkeypatch.setattr('src.importlens.verify._run_program', run)
+    assert verify_imports(import_list, cache=cache) == ["import dummy", "from os import dummy"]
+
+
+@pytest.mark.parametrize("use_worker", [False, True])
+def test_unverified(cache, use_worker):
+    """Tests that only the statements whose status was reported are cached."""
+    from src.importlens import VerifierWorker
+    worker = VerifierWorker() if use_worker else None
+    try:
+        import_list = ["import os; raise RuntimeError", "import importlens_dummy"]
+        assert verify_imports(import_list, cache=cache, worker=worker) == ["import importlens_dummy"]
+        assert cache.get_many(import_list) == {"import os; raise RuntimeError": True, "import importlens_dummy": False}
+
+        cache.clear()
+        import_list = ["import os; os._exit(0)", "import json"]
+        with pytest.warns(UserWarning):
+            assert verify_imports(import_list, cache=cache, worker=worker) == import_list
+        assert len(cache) == 0
+    finally:
+        worker is not None and worker.close()
+
+
+def test_executable(cache):
+    """Tests that the results are keyed by the interpreter that verified them."""
+    cache.put_many({"import os": True}, executable='/importlens/python')
+    assert cache.get_many(["import os"]) == {}
+    assert cache.get_many(["import os"], executable='/importlens/python') == {"import os": True}
+
+
+def test_profile(cache):
+    """Tests that the profiled statements are neither read from nor written to the cache."""
+    cache.put_many({"import importlens_dummy": True})
+    invalid_list, profile_list = verify_imports(["import os", "import importlens_dummy"], cache=cache, profile=True)
+    assert invalid_list == ["import importlens_dummy"] and len(profile_list) == 2
+    assert cache.get_many(["import os"]) == {}
+
+
+def test_eviction(cache):
+    """Tests that the least recently used results are evicted."""
+    cache.put_many({"import a": True, "import b": True, "import c": False})
+    cache.get_many(["import a"])
+    cache.put_many({"import d": True})
+    assert len(cache) == 3
+    assert {"import a", "import d"} <= cache.get_many(["import a", "import b", "import c", "import d"]).keys()
+
+
+def test_invalidation(cache, monkeypatch):
+    """Tests that the results are invalidated when the environment changes."""
+    cache.put_many({"import os": True})
+    monkeypatch.setattr(cache_module, 'environment_fingerprint', lambda executable=None: 'changed')
+    assert cache.get_many(["import os"]) == {}
+    assert len(cache) == 0
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# tests/test_distributions.py
+import os
+from importlib import metadata
+import pytest
+from src.importlens import DistributionIndex
+import src.importlens.distributions as distributions_module
+
+
+def test_lookup(tmp_path):
+    """Tests the distributions of top-level modules and submodules."""
+    index = DistributionIndex(path=os.path.join(tmp_path, 'distributions.json'))
+    version = metadata.version('pytest')
+    assert index.lookup('pytest') == [('pytest', version)]
+    assert index.lookup('_pytest.fixtures') == [('pytest', version)]
+    assert index.lookup('os') == []
+    assert index.lookup('dummy') == []
+
+
+def test_requirements(tmp_path):
+    """Tests the requirements of statements, leaving out the standard library."""
+    index = DistributionIndex(path=os.path.join(tmp_path, 'distributions.json'))
+    requirements = index.requirements(["import os, pytest", "from _pytest.fixtures import fixture", "import dummy"])
+    assert requirements == [f"pytest=={metadata.version('pytest')}"]
+    with pytest.raises(ValueError):
+        index.requirements(["x = 1"])
+
+
+def test_persistence(tmp_path, monkeypatch):
+    """Tests that a saved index is loaded without reading the metadata again."""
+    path = os.path.join(tmp_path, 'distributions.json')
+    size = len(DistributionIndex(path=path))
+    assert os.path.exists(path)
+
+    def fail():
+        raise AssertionError("The metadata is read again")
+    monkeypatch.setattr(metadata, 'distributions', fail)
+    index = DistributionIndex(path=path)
+    assert len(index) == size and index.lookup('pytest')
+
+
+def test_invalidation(tmp_path, monkeypatch):
+    """Tests that a saved index is rebuilt when the environment changes."""
+    path = os.path.join(tmp_path, 'distributions.json')
+    DistributionIndex(path=path)
+    monkeypatch.setattr(distributions_module, 'environment_fingerprint', lambda: 'changed')
+    monkeypatch.setattr(metadata, 'distributions', lambda: [])
+    assert len(DistributionIndex(path=path)) == 0
+
+    def fail():
+        raise AssertionError("The metadata is read again")
+    monkeypatch.setattr(metadata, 'distributions', fail)
+    assert len(DistributionIndex(path=path)) == 0  # saved with the new fingerprint
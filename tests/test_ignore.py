@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# tests/test_ignore.py
+import pickle
+
+from src.importlens import IgnoreMatcher, inspect_imports, scan_source
+
+
+def test_patterns():
+    """Tests that names, prefixes and glob patterns match only the intended names."""
+    matcher = IgnoreMatcher(['np', 'matplotlib.*', '_pytest*', 'os.pa?h'])
+    assert 'np' in matcher
+    assert 'numpy' not in matcher
+    assert 'matplotlib.pyplot' in matcher
+    assert 'matplotlib.cm.viridis' in matcher
+    assert 'matplotlib' not in matcher
+    assert 'matplotlibx.pyplot' not in matcher
+    assert '_pytest' in matcher and '_pytest.fixtures' in matcher
+    assert 'pytest' not in matcher
+    assert 'os.path' in matcher and 'os.patch' not in matcher
+
+
+def test_matches():
+    """Tests that a module, an object or an alias matching the list is ignored."""
+    matcher = IgnoreMatcher(['numpy', 'sqrt', 'plt'])
+    assert matcher.matches('numpy.random', 'numpy.random', 'random')  # top-level module
+    assert matcher.matches('math', 'sqrt', 'square_root')
+    assert matcher.matches('matplotlib.pyplot', 'matplotlib.pyplot', 'plt')
+    assert not matcher.matches('math', 'floor', 'floor')
+
+
+def test_compile_and_pickle():
+    """Tests that a matcher is compiled once, pickled with its patterns and extended by `+`."""
+    matcher = IgnoreMatcher(['a.*', 'b*', 'c'])
+    assert IgnoreMatcher.compile(matcher) is matcher
+    assert list(IgnoreMatcher.compile(['c'])) == ['c']
+    copy = pickle.loads(pickle.dumps(matcher))
+    assert list(copy) == ['a.*', 'b*', 'c'] and 'a.b' in copy and 'bc' in copy
+    assert list(matcher + ['d']) == ['a.*', 'b*', 'c', 'd']
+
+
+def test_inspect_imports_with_matcher():
+    """Tests that `inspect_imports` skips the names matched by a matcher."""
+    from math import floor, sqrt  # noqa: F401
+    import email.mime.text as text  # noqa: F401
+    ignore = IgnoreMatcher(['@py_builtins', '_pytest*', 'pytest', 'tests', 'pickle', 'email.*', 'sq*',
+                            'IgnoreMatcher', 'inspect_imports', 'scan_source'])
+    import_list = inspect_imports(ignore=ignore)
+    assert import_list == ["from math import floor"]
+
+
+def test_scan_source_with_patterns():
+    """Tests that `scan_source` skips the modules matched by the patterns."""
+    source = "import numpy as np\nimport matplotlib.pyplot as plt\nfrom _pytest.fixtures import fixture\n"
+    assert scan_source(source, ignore=['matplotlib.*', '_pytest*']) == ["import numpy as np"]
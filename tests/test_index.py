@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# tests/test_index.py
+import os
+import pytest
+from src.importlens import ImportIndex, scan_file
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / '__init__.py').write_text("from .core import run\n")
+    (tmp_path / 'pkg' / 'core.py').write_text("import os\nimport numpy as np\nfrom os.path import join, dirname\n")
+    (tmp_path / 'main.py').write_text("import json\nfrom pkg import core\nfrom os import path\n")
+    return tmp_path
+
+
+def test_update(repo, tmp_path_factory):
+    """Tests that only the changed files are rescanned, and the queries after each update."""
+    path = str(tmp_path_factory.mktemp('cache') / 'index.sqlite3')
+    with ImportIndex(str(repo), path=path) as index:
+        changes = index.update()
+        assert sorted(changes) == sorted((str(repo / p), 'added') for p in ['main.py', 'pkg/__init__.py', 'pkg/core.py'])
+        assert index.imports_of(str(repo / 'pkg' / 'core.py')) == scan_file(str(repo / 'pkg' / 'core.py'))
+        assert index.imports_of(str(repo / 'pkg' / '__init__.py')) == ["from pkg.core import run"]
+        assert index.importers('os') == [str(repo / 'main.py'), str(repo / 'pkg' / 'core.py')]
+        assert index.importers('os.path') == [str(repo / 'main.py'), str(repo / 'pkg' / 'core.py')]
+        assert index.importers('pkg.core') == [str(repo / 'main.py'), str(repo / 'pkg' / '__init__.py')]
+        assert index.statements() == [
+            "import json", "import numpy as np", "import os",
+            "from os import path", "from os.path import join, dirname", "from pkg import core", "from pkg.core import run",
+        ]
+        assert index.update() == []
+
+        # Touched without changes, modified, removed and added
+        os.utime(repo / 'main.py', ns=(0, 0))
+        (repo / 'pkg' / 'core.py').write_text("import sys\n")
+        (repo / 'pkg' / '__init__.py').unlink()
+        (repo / 'broken.py').write_text("import (\n")
+        with pytest.warns(UserWarning, match="broken.py"):
+            changes = index.update()
+        assert sorted(changes) == [
+            (str(repo / 'broken.py'), 'added'), (str(repo / 'pkg' / '__init__.py'), 'removed'),
+            (str(repo / 'pkg' / 'core.py'), 'modified'),
+        ]
+        assert index.importers('numpy') == []
+        assert index.importers('pkg.core') == [str(repo / 'main.py')]
+        assert list(index.errors()) == [str(repo / 'broken.py')]
+        assert len(index) == 3
+
+    # Persistent, and rebuilt with other options
+    with ImportIndex(str(repo), path=path) as index:
+        assert len(index) == 3 and index.update() == []
+    with ImportIndex(str(repo), path=path, ignore=['os*']) as index:
+        assert len(index) == 0
+        with pytest.warns(UserWarning):
+            index.update()
+        assert index.importers('os') == []
+
+
+def test_update_package(repo, tmp_path_factory):
+    """Tests that the files whose package changed are rescanned, since their relative imports change."""
+    (repo / 'pkg' / 'util.py').write_text("from . import core\n")
+    path = str(tmp_path_factory.mktemp('cache') / 'index.sqlite3')
+    with ImportIndex(str(repo), path=path) as index:
+        index.update()
+        assert index.imports_of(str(repo / 'pkg' / 'util.py')) == ["from pkg import core"]
+
+        (repo / 'pkg' / '__init__.py').unlink()
+        assert sorted(index.update()) == [
+            (str(repo / 'pkg' / '__init__.py'), 'removed'), (str(repo / 'pkg' / 'core.py'), 'modified'),
+            (str(repo / 'pkg' / 'util.py'), 'modified'),
+        ]
+        assert index.imports_of(str(repo / 'pkg' / 'util.py')) == ["from . import core"]
+
+        (repo / 'pkg' / '__init__.py').write_text("")
+        assert len(index.update()) == 3
+        assert index.imports_of(str(repo / 'pkg' / 'util.py')) == ["from pkg import core"]
+
+
+def test_watch(repo, tmp_path_factory):
+    """Tests that the watcher yields the changes of each update."""
+    path = str(tmp_path_factory.mktemp('cache') / 'index.sqlite3')
+    with ImportIndex(str(repo), path=path) as index:
+        watcher = index.watch(interval=0.01)
+        assert len(next(watcher)) == 3
+        (repo / 'main.py').write_text("import csv\n")
+        assert next(watcher) == [(str(repo / 'main.py'), 'modified')]
+        assert index.importers('csv') == [str(repo / 'main.py')]
@@ -2,10 +2,13 @@
 # tests/test_inspect_imports.py
 import pytest
 import warnings
-from src.importlens import inspect_imports, verify_imports
+from src.importlens import (
+    ImportRecord, format_imports, format_imports_json, inspect_imports, inspect_stack, inspect_threads, iter_imports,
+    verify_imports, verify_imports_parallel
+)
 
 
-default_ignore_list = ['@py_builtins', 'pytest', '_pytest', 'warnings', 'tests', 'verify_imports']
+default_ignore_list = ['@py_builtins', 'pytest', '_pytest', 'warnings', 'tests', 'verify_imports', 'verify_imports_parallel']
 module_not_found_msg = "Module not found (probably not installed)"
 verbose = False
 
@@ -23,11 +26,15 @@ test_cases_regular_imports = [
     ("import urllib", None, None,
      "import urllib"),
     ("from json.decoder import JSONDecoder, JSONDecodeError", None, None,
-     "from json.decoder import JSONDecoder, JSONDecodeError"),
+     "from json import JSONDecoder, JSONDecodeError"),
     ("from json.encoder import JSONEncoder", None, None,
-     "from json.encoder import JSONEncoder"),
+     "from json import JSONEncoder"),
     ("from json.encoder import re", None, None,
      "import re"),
+    ("from json.encoder import c_make_encoder", None, None,
+     "from json.encoder import c_make_encoder"),
+    ("from _bisect import bisect_left as bl\nfrom _operator import add", None, None,
+     "from bisect import bisect_left as bl\nfrom operator import add"),
 ]
 
 test_cases_regular_imports_need_install = [
@@ -47,7 +54,7 @@ test_cases_regular_imports_need_install = [
 
 test_cases_wildcard_imports = [
     ("from os import *", None, None,
-     "import posixpath as path\nfrom builtins import OSError as error\nfrom os import *\nfrom posix import *"),
+     "import posixpath as path\nfrom builtins import OSError as error\nfrom os import *"),
     # ("from sys import *", None, None,
     #  "import sys.monitoring as monitoring\nfrom sys import *"),  # where "import sys.monitoring as monitoring" is invalid and only appears in python3.12
     ("from datetime import *", None, None,
@@ -59,7 +66,7 @@ test_cases_wildcard_imports = [
     ("from random import *", None, None,
      "from random import *"),
     ("from json import *", None, None,
-     "from json import *\nfrom json.decoder import JSONDecoder, JSONDecodeError\nfrom json.encoder import JSONEncoder"),
+     "from json import *"),
     ("from csv import *", None, None,
      "from csv import *"),
     ("from collections import *", None, None,
@@ -71,7 +78,7 @@ test_cases_wildcard_imports = [
     ("from pathlib import *", None, None,
      "from pathlib import *"),
     ("from json.decoder import *", None, None,
-     "from json.decoder import JSONDecoder, JSONDecodeError"),
+     "from json import JSONDecoder, JSONDecodeError"),
 ]
 
 test_cases_max_obj = [
@@ -98,6 +105,11 @@ test_cases_ignore = [
     ("import matplotlib.pyplot as plt", None, ['matplotlib.pyplot',], ""),
     ("import matplotlib.pyplot as plt", None, ['pyplot',], ""),
     ("import matplotlib.pyplot as plt", None, ['plt',], ""),
+    ("import matplotlib.pyplot as plt", None, ['matplotlib.*',], ""),
+    ("import email.mime.text as text\nimport email", None, ['email.*',], "import email"),
+    ("from math import floor, sqrt", None, ['s*',], "from math import floor"),
+    ("from operator import add, mul", None, ['operator.a?d',], "from operator import mul"),
+    ("from operator import add", None, ['_operator',], "from operator import add"),  # defined in '_operator'
 ]
 
 test_cases_max_obj_ignore = [
@@ -124,7 +136,7 @@ def test_imports(import_str: str, max_obj: int, ignore: list[str], expected):
     if max_obj is not None:
         kwargs |= {'max_obj': max_obj}
     if ignore is not None:
-        kwargs['ignore'] += ignore
+        kwargs['ignore'] = kwargs['ignore'] + ignore
     try:
         exec(import_str)
         results = '\n'.join(inspect_imports(**kwargs))
@@ -134,6 +146,46 @@ def test_imports(import_str: str, max_obj: int, ignore: list[str], expected):
         pytest.skip(reason=f"{module_not_found_msg}: {import_str}")
 
 
+def _outer_frame(**kwargs):
+    import json as js  # noqa
+    return _inner_frame(**kwargs)
+
+
+def _inner_frame(**kwargs):
+    from math import floor  # noqa
+    return inspect_stack(ignore=default_ignore_list, limit=2, **kwargs)
+
+
+def test_stack():
+    """Tests the import statements of each frame in the stack."""
+    results = _outer_frame()
+    assert [(label.split()[0], import_list) for label, import_list in results.items()] == [
+        ('_inner_frame', ["from math import floor"]),
+        ('_outer_frame', ["import json as js"]),
+    ]
+    assert _outer_frame(group_by='module') == {__name__: ["import json as js", "from math import floor"]}
+
+
+def test_threads():
+    """Tests the import statements of the frames in all threads."""
+    import threading
+
+    def wait(event):
+        import json as jt  # noqa
+        event.wait()
+
+    event = threading.Event()
+    thread = threading.Thread(target=wait, args=(event,), name='importlens-test')
+    thread.start()
+    try:
+        results = inspect_threads(ignore=default_ignore_list + ['threading'])
+    finally:
+        event.set()
+        thread.join()
+    assert [import_list for label, import_list in results.items() if label.startswith(f"importlens-test: wait ({__file__}:")] == \
+        [["import json as jt"]]
+
+
 #------------------------------------------------------------------------------|
 # name1, name2, replaceable
 test_cases_module_names_replaceable = [
@@ -309,3 +361,107 @@ def test_verification(import_list: list[str], timeout, expected):
         with pytest.warns(UserWarning, match="Timed out"):
             invalid_list = verify_imports(import_list, timeout=timeout)
     assert invalid_list == expected
+
+
+#------------------------------------------------------------------------------|
+# import_list, jobs, timeout, expected (valid, invalid, timed_out)
+test_cases_verify_parallel = [
+    (["import os", "import dummy", "from os import dummy"], None, None,
+     (["import os"], ["import dummy", "from os import dummy"], [])),
+    (["import json", "import time; time.sleep(10)", "from json import dumps", "import math"], 2, 1,
+     (["import json", "from json import dumps", "import math"], [], ["import time; time.sleep(10)"])),
+    (["import time; time.sleep(10)", "from time import sleep", "import dummy"], 1, 1,
+     (["from time import sleep"], ["import dummy"], ["import time; time.sleep(10)"])),
+    ([], None, None, ([], [], [])),
+]
+
+@pytest.mark.parametrize("import_list, jobs, timeout, expected", test_cases_verify_parallel)
+def test_verification_parallel(import_list: list[str], jobs, timeout, expected):
+    """Tests the parallel import verification with a time budget for each statement."""
+    kwargs = {'jobs': jobs}
+    if timeout is not None:
+        kwargs['timeout'] = timeout
+    assert tuple(verify_imports_parallel(import_list, **kwargs)) == expected
+
+
+def test_verification_parallel_startup(monkeypatch):
+    """Tests the statements of a process that is not started in time, or cannot be started."""
+    import subprocess
+    import_list = ["import os", "import dummy"]
+    monkeypatch.setattr('src.importlens.verify._STARTUP_TIMEOUT', 0)
+    assert tuple(verify_imports_parallel(import_list, jobs=1)) == ([], [], import_list)
+    monkeypatch.undo()
+
+    popen = subprocess.Popen
+    calls = []
+
+    def fail(*args, fail_times=1, **kwargs):
+        calls.append(args)
+        if len(calls) <= fail_times:
+            raise OSError("Cannot start.")
+        return popen(*args, **kwargs)
+
+    monkeypatch.setattr(subprocess, 'Popen', fail)
+    assert tuple(verify_imports_parallel(import_list, jobs=1)) == (["import os"], ["import dummy"], [])
+    calls.clear()
+    monkeypatch.setattr(subprocess, 'Popen', lambda *args, **kwargs: fail(*args, fail_times=2, **kwargs))
+    with pytest.raises(OSError, match="Cannot start"):
+        verify_imports_parallel(import_list, jobs=1)
+
+
+def test_verification_profile():
+    """Tests the cost of each statement reported by the import verification."""
+    import_list = ["import os", "import dummy", "import email.mime.text"]
+    invalid_list, profile_list = verify_imports(import_list, profile=True)
+    assert invalid_list == ["import dummy"]
+    assert [(p.statement, p.valid) for p in profile_list] == \
+        [("import os", True), ("import dummy", False), ("import email.mime.text", True)]
+    assert profile_list[0].new_modules == 0  # already imported at startup
+    assert profile_list[2].new_modules > 0 and profile_list[2].peak_memory > 0 and profile_list[2].seconds > 0
+
+    with pytest.warns(UserWarning, match="Timed out"):
+        invalid_list, profile_list = verify_imports(["import time; time.sleep(10)"], timeout=0.5, profile=True)
+    assert (invalid_list, profile_list) == (["import time; time.sleep(10)"], [])
+
+
+def test_verification_profile_error(monkeypatch):
+    """Tests that the profiles are returned when the process cannot be started."""
+    def run(*args, **kwargs):
+        raise OSError("Cannot start.")
+
+    monkeypatch.setattr('src.importlens.verify._run_program', run)
+    with pytest.warns(UserWarning, match="Cannot start"):
+        assert verify_imports(["import os"], profile=True) == (["import os"], [])
+
+
+def test_iter_imports():
+    """Tests the records yielded by `iter_imports` and their formatters."""
+    import json
+    from math import floor, sqrt as square_root  # noqa: F401
+    import email.mime.text as text  # noqa: F401
+    ignore = default_ignore_list + ['json', 'ImportRecord', 'iter_imports', 'format_imports', 'format_imports_json']
+    records = list(iter_imports(ignore=ignore))
+    assert records == [
+        ImportRecord('math', 'floor', None, 'object'),
+        ImportRecord('math', 'sqrt', 'square_root', 'object'),
+        ImportRecord('email.mime.text', None, 'text', 'module'),
+    ]
+    assert format_imports(records) == [
+        "import email.mime.text as text", "from math import floor", "from math import sqrt as square_root"
+    ]
+    assert json.loads(format_imports_json(records + records))[0] == {
+        'module': 'math', 'name': 'floor', 'alias': None, 'kind': 'object'
+    }
+    first = next(iter_imports(ignore=ignore))  # stops early
+    assert first == records[0]
+
+
+def test_pasted_file():
+    """Tests that the file pasted into a namespace, e.g., in a LeetCode editor, does not inspect its own imports."""
+    import os
+    from src.importlens import importlens
+    with open(importlens.__file__) as f:
+        source = f.read()
+    namespace = {'__name__': '__main__'}
+    exec(compile(source + "\nimport os\nfrom math import floor\n", os.path.basename(importlens.__file__), 'exec'), namespace)
+    assert eval("inspect_imports()", namespace) == ["import os", "from math import floor"]
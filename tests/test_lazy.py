@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# tests/test_lazy.py
+import os
+import sys
+import subprocess
+import pytest
+from src.importlens import generate_lazy_module
+
+
+def test_generate_lazy_module(tmp_path):
+    """Tests that the generated module imports each name on its first access."""
+    import_list = [
+        "import email.mime.text",
+        "import json as j",
+        "import xml.sax, xml.etree.ElementTree",
+        "import sys, importlib as lib",
+        "from os import path",
+        "from xml import dom",
+        "from html import *",
+        "import dummy",
+    ]
+    source = generate_lazy_module(import_list)
+    assert "# Invalid: import dummy" in source
+    with open(os.path.join(tmp_path, 'lazy_imports.py'), 'w') as f:
+        f.write(source)
+
+    test_program = """
+import sys
+import lazy_imports
+assert 'json' not in sys.modules and 'email.mime.text' not in sys.modules
+assert lazy_imports.j is sys.modules['json']
+assert lazy_imports.email is sys.modules['email'] and 'email.mime.text' in sys.modules
+from lazy_imports import path, dom, escape
+assert dom is sys.modules['xml.dom']
+assert lazy_imports.xml.sax and lazy_imports.xml.etree.ElementTree and lazy_imports.xml.dom
+assert lazy_imports.sys is sys and lazy_imports.lib is sys.modules['importlib']
+assert escape('<') == '&lt;'
+try:
+    lazy_imports.dummy
+except AttributeError:
+    print('ok')
+"""
+    result = subprocess.run([sys.executable, "-c", test_program], cwd=tmp_path, capture_output=True, text=True)
+    assert result.stdout.strip() == 'ok', result.stderr
+
+
+def test_not_an_import():
+    """Tests that statements other than imports, and names of the generated module, are rejected."""
+    with pytest.raises(ValueError):
+        generate_lazy_module(["print('hello')"], verify=False)
+    with pytest.raises(ValueError, match="_modules"):
+        generate_lazy_module(["import os as _modules"], verify=False)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# tests/test_main.py
+import os
+import sys
+import json
+import subprocess
+import pytest
+from src.importlens.__main__ import main
+
+_SCRIPTS = {
+    'a.py': "import os\nimport json as js\nfrom math import floor, sqrt\nprint('noise')\n",
+    'b.py': "import sys\nfrom collections import OrderedDict\nsys.exit(3)\n",
+    'c.py': "import csv\nimport importlens_dummy\n",
+    'd.py': "import time\nimport email\ntime.sleep(100)\n",
+}
+
+
+@pytest.fixture
+def scripts(tmp_path):
+    for name, source in _SCRIPTS.items():
+        (tmp_path / name).write_text(source)
+    return tmp_path
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_main(scripts, capsys, jobs):
+    """Tests the results of scripts that finish, exit, raise and hang, in order."""
+    if jobs == 1 and not hasattr(os, 'fork'):
+        pytest.skip("The timeout requires `os.fork`.")
+    assert main([str(scripts), '--jobs', str(jobs), '--verify', '--timeout', '2']) == 0
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [os.path.basename(r['target']) for r in results] == ['a.py', 'b.py', 'c.py', 'd.py']
+    a, b, c, d = results
+    assert a['imports'] == ["import json as js", "import os", "from math import floor, sqrt"]
+    assert a['error'] is None and a['invalid'] == []
+    assert b['imports'] == ["import sys", "from collections import OrderedDict"]
+    assert b['error'] == "SystemExit: 3"
+    assert c['imports'] == ["import csv"]
+    assert c['error'].startswith("ModuleNotFoundError")
+    assert d['imports'] is None and d['error'].startswith("Timed out")
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="Requires `os.fork`.")
+def test_no_fork_with_threads(scripts):
+    """Tests that no process is forked after the verifier starts its thread, which is deprecated on 3.12."""
+    proc = subprocess.run(
+        [sys.executable, '-W', 'always::DeprecationWarning', '-m', 'src.importlens', '--jobs', '1', '--verify',
+         str(scripts / 'a.py'), str(scripts / 'c.py')],
+        capture_output=True, text=True, timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert "DeprecationWarning" not in proc.stderr
+    assert [json.loads(line)['invalid'] for line in proc.stdout.splitlines()] == [[], []]
+
+
+def test_module():
+    """Tests running a module with `python -m`."""
+    proc = subprocess.run(
+        [sys.executable, '-m', 'src.importlens', '--module', 'json.tool', '--jobs', '1'],
+        capture_output=True, text=True, timeout=60,
+    )
+    assert proc.returncode == 0
+    result = json.loads(proc.stdout)
+    assert result['target'] == 'json.tool'
+    assert "import json" in result['imports'] and "import argparse" in result['imports']
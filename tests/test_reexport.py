@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# tests/test_reexport.py
+import gc
+import os
+import sys
+import types
+import weakref
+import pytest
+from src.importlens import ReexportIndex
+
+
+@pytest.fixture
+def fake_modules():
+    """A public module re-exporting a private one, and a module object that is not in `sys.modules`."""
+    private = types.ModuleType('_importlens_private')
+    exec("def func(): pass", vars(private))
+    public = types.ModuleType('importlens_public')
+    public.func = private.func
+    public.renamed = private.func
+    public.sub = types.ModuleType('importlens_public.sub')
+    sys.modules.update({'_importlens_private': private, 'importlens_public': public})
+    yield private, public
+    del sys.modules['_importlens_private'], sys.modules['importlens_public']
+
+
+def test_locate(fake_modules, tmp_path):
+    """Tests the public modules and names located for objects, and loading them from a file."""
+    private, public = fake_modules
+    path = os.path.join(tmp_path, 'reexports.json')
+    index = ReexportIndex(path=path)
+    assert index.locate(private.func, '_importlens_private', 'func') == ('importlens_public', 'func')
+    assert index.locate(os.getcwd, 'posix', 'getcwd') == ('os', 'getcwd')
+    assert index.locate(os.path.join, 'posixpath', 'join') == ('posixpath', 'join')
+    assert index.locate_module(public.sub) == ('importlens_public', 'sub')
+    assert index.locate_module(os) is None
+
+    index.save()
+    del sys.modules['importlens_public']
+    index = ReexportIndex(path=path)
+    assert index.locate(private.func, '_importlens_private', 'func') == ('importlens_public', 'func')
+    sys.modules['importlens_public'] = public
+
+
+def test_refresh(fake_modules):
+    """Tests that the objects of removed modules and attributes are not kept alive."""
+    private, public = fake_modules
+    index = ReexportIndex(path=False)
+    exec("def first(): pass\ndef second(): pass", vars(public))
+    index.refresh()
+    first, second = weakref.ref(public.first), weakref.ref(public.second)
+    assert index.locate(public.first, 'importlens_public', 'first') == ('importlens_public', 'first')
+
+    del public.first
+    index.refresh()
+    gc.collect()
+    assert first() is None and second() is not None
+
+    module = types.ModuleType('importlens_removed')
+    exec("def func(): pass", vars(module))
+    func = weakref.ref(module.func)
+    sys.modules['importlens_removed'] = module
+    index.refresh()
+    del sys.modules['importlens_removed'], module
+    index.refresh()
+    gc.collect()  # the function and the globals of the module refer to each other
+    assert func() is None
+
+
+def test_locate_memo(fake_modules):
+    """Tests that located names are reused until the index changes."""
+    private, public = fake_modules
+    index = ReexportIndex(path=False)
+    assert index.locate(private.func, '_importlens_private', 'func') == ('importlens_public', 'func')
+    assert len(index._memo) == 1
+
+    index.refresh()  # nothing changed
+    assert len(index._memo) == 1
+    shorter = types.ModuleType('importlens_pub')
+    shorter.func = private.func
+    sys.modules['importlens_pub'] = shorter
+    index.refresh()
+    assert index.locate(private.func, '_importlens_private', 'func') == ('importlens_pub', 'func')
+    del sys.modules['importlens_pub']
+    index.refresh()
+    assert index.locate(private.func, '_importlens_private', 'func') == ('importlens_public', 'func')
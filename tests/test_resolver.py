@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# tests/test_resolver.py
+import gc
+import inspect
+import sys
+import types
+import weakref
+import pytest
+from src.importlens.resolver import ModuleResolver
+
+
+def _sample_objects():
+    import math
+    import os
+    import json
+    import functools
+    from collections import OrderedDict
+    from json.decoder import JSONDecodeError
+    return [
+        1, 'str', 1.5, None, [1], {'a': 1}, (1,), math.inf,
+        math, os, os.path, math.floor, os.path.join, json.dumps, functools.partial(print),
+        OrderedDict, JSONDecodeError, dict, print, types.SimpleNamespace(),
+        os.path.join.__code__, inspect.currentframe(), _sample_objects,
+    ]
+
+
+@pytest.mark.parametrize("obj", _sample_objects())
+def test_getmodule(obj):
+    """Tests that the resolver returns the same results as `inspect.getmodule`."""
+    assert ModuleResolver().getmodule(obj) is inspect.getmodule(obj)
+
+
+def test_refresh():
+    """Tests that modules added to or removed from `sys.modules` are picked up incrementally."""
+    resolver = ModuleResolver()
+    module = types.ModuleType('_importlens_dummy')
+    exec("class Dummy: pass\nclass Removed: pass", vars(module))
+    dummy_cls = module.Dummy
+    removed_cls = weakref.ref(module.Removed)
+    assert resolver.getmodule(dummy_cls) is None
+
+    sys.modules['_importlens_dummy'] = module
+    try:
+        resolver.refresh()
+        assert resolver.getmodule(dummy_cls) is module is inspect.getmodule(dummy_cls)
+
+        # Removed attributes are not kept alive
+        del module.Removed
+        resolver.refresh()
+        gc.collect()  # a class refers to itself through its `__dict__`
+        assert removed_cls() is None
+    finally:
+        del sys.modules['_importlens_dummy']
+    resolver.refresh()
+    assert resolver.getmodule(dummy_cls) is None is inspect.getmodule(dummy_cls)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# tests/test_session.py
+import math
+import json
+import operator
+import types
+import pytest
+from src.importlens import ImportSession, inspect_imports
+
+
+def _inspect(namespace: dict) -> list[str]:
+    """Calls `inspect_imports` from a frame whose globals are `namespace`."""
+    return eval("inspect_imports()", namespace | {'inspect_imports': inspect_imports})
+
+
+def test_update():
+    """Tests that the patched statements are the same as those of a full scan after each change."""
+    namespace = {'__name__': '__session__', 'floor': math.floor, 'js': json, 'x': 1}
+    session = ImportSession()
+    assert session.update(namespace) == _inspect(namespace) == ["import json as js", "from math import floor"]
+    assert session.changes == 4
+
+    assert session.update(namespace) == _inspect(namespace)
+    assert session.changes == 0
+
+    namespace |= {'sqrt': math.sqrt, 'isnan': math.isnan, 'add': operator.add}  # added
+    assert session.update(namespace) == _inspect(namespace)
+    assert session.changes == 3
+
+    namespace['ceil'] = math.ceil  # more than `max_obj`
+    assert session.update(namespace) == _inspect(namespace) == \
+        ["import json as js", "from math import *", "from operator import add"]
+
+    del namespace['ceil'], namespace['js']  # removed
+    namespace['add'] = operator.mul  # rebound
+    assert session.update(namespace) == _inspect(namespace) == \
+        ["from math import floor, sqrt, isnan", "from operator import mul as add"]
+    assert session.changes == 3
+
+
+def test_update_frame():
+    """Tests inspecting the caller's frame."""
+    session = ImportSession(ignore=['@py_builtins', 'pytest', '_pytest', 'tests', 'ImportSession', 'inspect_imports', '_inspect'])
+    from math import floor  # noqa
+    import_list = session.update()
+    assert import_list == ["import json", "import math", "import operator", "import types",
+                           "from math import floor"]
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# tests/test_static.py
+import os
+import pytest
+from src.importlens import check_import, scan_source, scan_tree, verify_imports
+
+
+#------------------------------------------------------------------------------|
+# source, max_obj, ignore, package, expected (set None to use the default argument values)
+test_cases_scan_source = [
+    ("from math import floor, sqrt, isnan", None, None, None,
+     "from math import floor, sqrt, isnan"),
+    ("from math import floor, inf, sqrt, isnan", None, None, None,
+     "from math import *"),
+    ("from math import floor, inf, sqrt, isnan", 4, None, None,
+     "from math import floor, inf, sqrt, isnan"),
+    ("import numpy as np\nimport numpy.random as random\nfrom numpy.random import rand", None, None, None,
+     "import numpy as np\nimport numpy.random as random\nfrom numpy.random import rand"),
+    ("import os\ndef f():\n    import os\n    from os import path as p", None, None, None,
+     "import os\nfrom os import path as p"),
+    ("from __future__ import annotations\nfrom _bisect import bisect_left", None, None, None,
+     "from bisect import bisect_left"),
+    ("from json import dumps\nfrom json import *", None, None, None,
+     "from json import *"),
+    ("import numpy as np\nfrom operator import add as addition, mul", None, ['np', 'addition'], None,
+     "from operator import mul"),
+    ("from operator import add, mul", None, ['operator.add'], None,
+     "from operator import mul"),
+    ("from . import a\nfrom ..b import c", None, None, 'pkg.sub',
+     "from pkg.b import c/from pkg.sub import a"),
+    ("from . import a\nfrom ..b import c", None, None, None,
+     "from . import a\nfrom ..b import c"),
+]
+
+@pytest.mark.parametrize("source, max_obj, ignore, package, expected", test_cases_scan_source)
+def test_scan_source(source, max_obj, ignore, package, expected):
+    """Tests the statements reconstructed from the source code."""
+    kwargs = {'package': package}
+    if max_obj is not None:
+        kwargs['max_obj'] = max_obj
+    if ignore is not None:
+        kwargs['ignore'] = ignore
+    assert '\n'.join(scan_source(source, **kwargs)) == expected.replace('/', '\n')
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_scan_tree(tmp_path, jobs):
+    """Tests scanning a source tree with relative imports and a file that cannot be parsed."""
+    os.makedirs(os.path.join(tmp_path, 'pkg', '__pycache__'))
+    files = {
+        'main.py': "import pkg\nfrom pkg.mod import f",
+        'pkg/__init__.py': "from .mod import f",
+        'pkg/mod.py': "import os\nfrom . import f",
+        'pkg/broken.py': "import (",
+        'pkg/__pycache__/cached.py': "import dummy",
+    }
+    for path, source in files.items():
+        with open(os.path.join(tmp_path, path), 'w') as f:
+            f.write(source)
+
+    with pytest.warns(UserWarning, match="broken.py"):
+        results = {os.path.relpath(path, tmp_path): import_list for path, import_list in scan_tree(tmp_path, jobs=jobs)}
+    assert results == {
+        'main.py': ["import pkg", "from pkg.mod import f"],
+        os.path.join('pkg', '__init__.py'): ["from pkg.mod import f"],
+        os.path.join('pkg', 'mod.py'): ["import os", "from pkg import f"],
+    }
+
+
+#------------------------------------------------------------------------------|
+_PACKAGE_SOURCES = {
+    '__init__.py': "from .core import *\nfrom .extra import helper as aliased\nVERSION = 1\n",
+    'core.py': "__all__ = ['public']\ndef public(): pass\ndef other(): pass\ntry:\n    fast = 1\nexcept ImportError as error:\n    pass\n",
+    'extra.py': "def helper(): pass\n",
+    'lazy.py': "def __getattr__(name):\n    return name\n",
+    'dynamic.py': "__all__ = ['x'] + []\nglobals()['x'] = 1\n",
+    'star.py': "from .dynamic import *\n",
+    'branches.py': (
+        "import os\nimport sys\ndel os\nif __name__ == '__main__':\n    import json\n"
+        "if sys.platform == 'importlens':\n    special = 1\n"
+        "caught = 1\ntry:\n    import importlens_dummy\nexcept ImportError as caught:\n    pass\n"
+    ),
+}
+
+# statement, expected
+test_cases_check_import = [
+    ("import os, os.path", True),
+    ("import importlens_dummy", False),
+    ("from math import sqrt", True),
+    ("from math import importlens_dummy", None),
+    ("from json import *", True),
+    ("from . import x", None),
+    ("x = 1", None),
+    ("import importlens_pkg.core", True),
+    ("import importlens_pkg.missing", False),
+    ("from importlens_pkg import public, aliased, VERSION, extra", True),
+    ("from importlens_pkg import other", None),  # not in `__all__` of `core`
+    ("from importlens_pkg.core import other", True),
+    ("from importlens_pkg.core import fast", None),  # bound in `try`
+    ("from importlens_pkg.core import error", None),
+    ("from importlens_pkg.lazy import anything", None),
+    ("from importlens_pkg.dynamic import x", None),
+    ("from importlens_pkg.star import x", None),
+    ("from importlens_pkg import public, missing", None),
+    ("from importlens_pkg.branches import sys", True),
+    ("from importlens_pkg.branches import os", None),  # deleted
+    ("from importlens_pkg.branches import json", None),  # only in `if __name__ == '__main__':`
+    ("from importlens_pkg.branches import special", None),
+    ("from importlens_pkg.branches import caught", None),  # deleted after `except ... as caught`
+    ("from importlens_pkg.branches import missing", None),
+    ("from importlens_pkg import __path__, __file__", True),
+    ("from importlens_pkg.core import __path__", None),
+    ("from sys import __file__", None),
+]
+
+
+@pytest.fixture
+def fake_package(tmp_path, monkeypatch):
+    os.makedirs(os.path.join(tmp_path, 'importlens_pkg'))
+    for filename, source in _PACKAGE_SOURCES.items():
+        with open(os.path.join(tmp_path, 'importlens_pkg', filename), 'w') as f:
+            f.write(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize("import_str, expected", test_cases_check_import)
+def test_check_import(fake_package, import_str, expected):
+    """Tests the statements checked without executing the modules."""
+    import sys
+    assert check_import(import_str) is expected
+    assert 'importlens_pkg' not in sys.modules
+
+
+def test_verify_static(fake_package, monkeypatch):
+    """Tests that the results are the same as those of executing the statements."""
+    monkeypatch.setenv('PYTHONPATH', fake_package)
+    import_list = [import_str for import_str, _ in test_cases_check_import if import_str.startswith(('import', 'from i'))]
+    import_list += ["from json import dumps", "import os.importlens_dummy"]
+    # Deleted, or bound only in `try` or `if __name__ == '__main__':`
+    import_list += ["from shutil import zlib", "from threading import _thread", "from copy import types",
+                    "from pickle import argparse"]
+    # Bound in ways the sources do not show
+    import_list += ["from ssl import PROTOCOL_TLS_CLIENT", "from http import __path__", "from json import __path__"]
+    assert verify_imports(import_list, static=True) == verify_imports(import_list)
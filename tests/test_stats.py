@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# tests/test_stats.py
+import json
+from collections import OrderedDict
+from src.importlens import PhaseStats, inspect_imports, inspect_stack, verify_imports
+
+
+def test_inspect_stats():
+    """Tests the phases and counters of inspecting, and that the statements are the same as without `stats`."""
+    stats = PhaseStats()
+    ignore = ['@py_builtins', 'pytest', '_pytest', 'tests', 'PhaseStats', 'src.*']
+    expected = inspect_imports(ignore=ignore)
+    import_list = inspect_imports(ignore=ignore, stats=stats)
+    assert import_list == expected
+    assert "import json" in import_list and "from collections import OrderedDict" in import_list
+    assert set(stats.seconds) == {'capture', 'resolve', 'ignore', 'classify', 'format'}
+    assert all(seconds >= 0 for seconds in stats.seconds.values())
+    counts = stats.counts
+    assert counts['records'] == len(import_list)
+    assert counts['objects_scanned'] >= counts['objects_skipped'] + counts['records']
+    assert 0 < counts['objects_resolved'] <= counts['objects_scanned']
+
+    stats.reset()
+    inspect_stack(limit=2, stats=stats)
+    assert stats.counts['objects_scanned'] > 0 and 'capture' in stats.seconds
+
+
+def test_verify_stats():
+    """Tests the phases and counters of verifying, reported to a callback."""
+    phases = []
+    stats = PhaseStats(callback=lambda phase, seconds: phases.append(phase))
+    assert verify_imports(["import os", "import importlens_dummy"], stats=stats) == ["import importlens_dummy"]
+    assert phases[:3] == ['cache', 'spawn', 'execute'] and 'parse' in phases
+    assert stats.seconds['execute'] > 0
+    assert stats.counts == {
+        'statements': 2, 'statements_cached': 0, 'statements_static': 0, 'statements_executed': 2,
+        'statements_invalid': 1,
+    }
+
+    stats.reset()
+    assert verify_imports(["import os", "from os import path"], static=True, stats=stats) == []
+    assert stats.counts['statements_static'] == 2 and stats.counts['statements_executed'] == 0
+    assert 'spawn' not in stats.seconds
+    assert json.loads(json.dumps(stats.as_dict()))['counts'] == stats.counts
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# tests/test_subinterpreters.py
+import sys
+import pytest
+from src.importlens import SubinterpreterPool, verify_imports
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with SubinterpreterPool() as pool:
+        yield pool
+
+
+def test_verification(pool):
+    """Tests the same results as a new Python process, whether subinterpreters are available or not."""
+    import_list = ["import os", " import importlens_dummy", "from json import loads, importlens_dummy", "import math"]
+    assert verify_imports(import_list, worker=pool) == verify_imports(import_list)
+    assert verify_imports([], worker=pool) == []
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="Requires Python 3.12 or later.")
+def test_isolation(pool):
+    """Tests that the imports do not leak into this process and that unusual statements fall back."""
+    assert pool.available
+    fallbacks = pool.fallbacks
+    assert pool.verify(["import importlens_dummy", "import tabnanny"]) == ["import importlens_dummy"]
+    assert 'tabnanny' not in sys.modules and pool.fallbacks == fallbacks
+    assert pool.verify(["import sys; sys.exit()"]) == []
+    assert pool.fallbacks == fallbacks + 1
+
+
+def test_unavailable():
+    """Tests that all statements fall back to a separate process before Python 3.12."""
+    if sys.version_info >= (3, 12):
+        pytest.skip("Subinterpreters are available.")
+    with SubinterpreterPool() as pool:
+        assert not pool.available
+        assert pool.verify(["import os", "import importlens_dummy"]) == ["import importlens_dummy"]
+        assert pool.fallbacks == 2
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# tests/test_tracer.py
+import sys
+import types
+import builtins
+from src.importlens import ImportTracer, inspect_imports
+
+_SOURCE = """
+import os
+import os.path as osp
+import email.mime.text
+from json import dumps as to_json, loads
+from math import *
+x = 1
+f = sys.intern if False else None
+
+def function():
+    import re
+    from operator import add, mul as times
+    global glob
+    import glob
+    return tracer.inspect()
+"""
+
+
+def _run(tracer) -> types.ModuleType:
+    module = types.ModuleType('traced')
+    module.sys = sys
+    module.tracer = tracer
+    with tracer:
+        exec(compile(_SOURCE, '<traced>', 'exec'), vars(module))
+    return module
+
+
+def test_module():
+    """Tests that the statements of the recorded names are the same as those of a full scan."""
+    tracer = ImportTracer()
+    module = _run(tracer)
+    expected = eval(
+        "inspect_imports(ignore=['sys', 'tracer', 'function'])", vars(module) | {'inspect_imports': inspect_imports}
+    )
+    assert tracer.inspect(module) == expected == [
+        "import email", "import os", "import posixpath as osp", "from json import dumps as to_json",
+        "from json import loads", "from math import *"
+    ]
+    assert builtins.__import__ is not tracer._import
+    assert tracer.calls >= 5 and tracer.seconds > 0  # and the imports in the modules imported for the first time
+
+    del module.loads  # removed
+    module.os = 1  # rebound
+    assert "from json import loads" not in tracer.inspect(module)
+    assert "import os" not in tracer.inspect(module)
+
+
+def test_frame():
+    """Tests the names imported in a function, including `global`."""
+    tracer = ImportTracer()
+    module = _run(tracer)
+    with tracer:
+        import_list = module.function()
+    assert "import re" in import_list and "from operator import add, mul as times" not in import_list
+    assert "from operator import add" in import_list and "from operator import mul as times" in import_list
+    assert "import glob" in tracer.inspect(module)
+
+
+def test_not_traced():
+    """Tests that the imports before tracing and `__import__` calls are not recorded."""
+    import json  # noqa: F401
+    tracer = ImportTracer()
+    with tracer:
+        __import__('csv')
+        import_list = tracer.inspect()
+    assert import_list == []
+    tracer.clear()
+    assert tracer.calls == 0
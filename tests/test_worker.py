@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# tests/test_worker.py
+import sys
+import shutil
+import subprocess
+import pytest
+from src.importlens import verify_imports, verify_imports_matrix, VerifierWorker
+from src.importlens.worker import get_verifier_worker
+
+
+@pytest.fixture(scope="module")
+def worker():
+    with VerifierWorker(preload=['json']) as worker:
+        yield worker
+
+
+@pytest.mark.parametrize(
+    "import_list, expected",
+    [
+        (["import os", "import dummy", "from os import dummy"], ["import dummy", "from os import dummy"]),
+        (["import os",], []),
+        (["import sys.monitoring as monitoring",], ["import sys.monitoring as monitoring",]),
+        ([], []),
+    ]
+)
+def test_verification(worker, import_list, expected):
+    """Tests the import verification with a long-lived worker."""
+    assert verify_imports(import_list, worker=worker) == expected
+    assert worker.ping()
+
+
+def test_no_leaks(worker):
+    """Tests that a module imported in one batch is not kept in the worker."""
+    worker.verify(["import sys; sys.modules['_importlens_dummy'] = sys"])
+    assert worker.verify(["import _importlens_dummy"]) == ["import _importlens_dummy"]
+
+
+def test_restart(worker):
+    """Tests that a hung or dead worker is restarted."""
+    with pytest.warns(UserWarning, match="Timed out"):
+        assert verify_imports(["import time; time.sleep(10)"], timeout=0.5, worker=worker) == \
+            ["import time; time.sleep(10)"]
+    assert worker.is_alive()
+
+    worker._process.kill()
+    worker._process.wait()
+    assert not worker.is_alive()
+    assert worker.verify(["import dummy"]) == ["import dummy"]
+    assert worker.ping()
+
+
+def test_verify_imports_matrix():
+    """Tests the statuses on the current interpreter and one that cannot be started."""
+    import_list = ["import os", " import importlens_dummy", "import os"]
+    with pytest.warns(UserWarning, match="importlens_missing_python"):
+        matrix = verify_imports_matrix(import_list, [sys.executable, '/importlens_missing_python'])
+    assert matrix.statements == ["import os", "import importlens_dummy"]
+    assert matrix.statuses == [['valid', 'invalid'], ['invalid', 'invalid']]
+    assert matrix.column(sys.executable) == {"import os": 'valid', "import importlens_dummy": 'invalid'}
+    assert matrix.incompatible() == ["import os", "import importlens_dummy"]
+    assert get_verifier_worker(sys.executable).is_alive()  # kept warm
+    assert verify_imports_matrix([], [sys.executable]).statuses == []
+
+
+def _find_python(version: str) -> str | None:
+    """Returns a working interpreter of a Python version on PATH, skipping e.g. inactive pyenv shims."""
+    executable = shutil.which(f'python{version}')
+    if executable is not None and subprocess.run([executable, '-c', 'pass'], capture_output=True).returncode == 0:
+        return executable
+    return None
+
+
+@pytest.mark.skipif(_find_python('3.10') is None, reason="Requires Python 3.10 on PATH.")
+def test_verify_imports_matrix_versions():
+    """Tests a module added in Python 3.11."""
+    matrix = verify_imports_matrix(["import tomllib"], [_find_python('3.10'), sys.executable])
+    assert matrix.statuses == [['invalid', 'valid' if sys.version_info >= (3, 11) else 'invalid']]